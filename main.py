@@ -2,137 +2,1596 @@ import math  # Add this import
 import numpy as np
 import pygame
 from pygame.locals import *
-import tkinter as tk
-from tkinter import ttk,messagebox
 from math import cos,sin
 from OpenGL.GL import *
 from OpenGL.GLU import *
+from OpenGL.GL import shaders
 import threading
+import argparse
+import ctypes
+import glob
+import json
+import os
+import struct
+import time
+import zipfile
+
+class BatchRenderer:
+    """Draws flat arrays of vertices with one of several GL drawing paths.
+
+    backend is one of BACKENDS. cache_key/version let static geometry reuse
+    its display list or VBO instead of being resent every frame."""
+
+    BACKENDS=["immediate","display_list","vertex_array","vbo","shader"]
+
+    VERTEX_SHADER="""
+    #version 120
+    uniform vec4 color;
+    void main(){
+        gl_Position=gl_ModelViewProjectionMatrix*gl_Vertex;
+        gl_FrontColor=color;
+    }
+    """
+
+    FRAGMENT_SHADER="""
+    #version 120
+    void main(){
+        gl_FragColor=gl_Color;
+    }
+    """
+
+    def __init__(self, backend):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown renderer backend: {backend}")
+        self.backend=backend
+        #cache_key -> (version, gl handle, vertex count)
+        self.cache={}
+        self.program=None
+        self.color_location=None
+
+        if backend=="shader":
+            self.program=shaders.compileProgram(
+                shaders.compileShader(self.VERTEX_SHADER,GL_VERTEX_SHADER),
+                shaders.compileShader(self.FRAGMENT_SHADER,GL_FRAGMENT_SHADER))
+            self.color_location=glGetUniformLocation(self.program,"color")
+
+    def draw(self, vertices, mode=GL_LINES, color=(1.0,1.0,1.0,1.0), cache_key=None, version=None):
+        vertices=np.ascontiguousarray(vertices,dtype=np.float32).reshape(-1,3)
+        if len(vertices)==0:
+            return
+        if len(color)==3:
+            color=(color[0],color[1],color[2],1.0)
 
-class MatrixInputGUI:
-    def __init__(self, callback):
-        self.callback=callback
-        # what does callback mean
-        self.matrix=None
-        self.root=None
-
-    def create_gui(self):
-        self.root=tk.Tk()
-        self.root.title("Linear Transformation Matrix Input")
-        self.root.geometry("500x400")
-        self.root.resizable(False,False)
-
-        main_frame=ttk.Frame(self.root, padding="10")
-        main_frame.grid(row=0,column=0,sticky="nsew")
-        
-        title_label=ttk.Label(main_frame, text="Enter Transformation Matrix",
-                              font=("Arial",14,"bold"))
-        title_label.grid(row=0,column=0,columnspan=3, pady=(0,20))        
+        if self.backend=="immediate":
+            glColor4f(*color)
+            glBegin(mode)
+            for vertex in vertices:
+                glVertex3f(vertex[0],vertex[1],vertex[2])
+            glEnd()
 
-        self.entries=[]
-        for i in range(3):
-            row_entries=[]
-            for j in range(3):
-                entry=ttk.Entry(main_frame, width=10, font=("Arial",12))
-                entry.grid(row=i+1, column=j,padx=5,pady=5)
-                if i==j:
-                    entry.insert(0,"1")
-                else:
-                    entry.insert(0,"0")
-                row_entries.append(entry)
-            self.entries.append(row_entries)
-
-        preset_frame=ttk.Frame(main_frame)
-        preset_frame.grid(row=4,column=0,columnspan=3,pady=20)
-
-        presets=[
-            ("Identity",np.eye(3)),
-            ("Scale 2x",np.diag([2,2,2])),
-            ("Scale XY",np.diag([2,2,1])),
-            ("Rotate Z 90°",np.array([[0,-1,0],[1,0,0],[0,0,1]])),
-            ("Rotate Y 90°",np.array([[0,0,1],[0,1,0],[-1,0,0]])),
-            ("Rotate X 90°",np.array([[1,0,0],[0,0,-1],[0,1,0]])),
-            ("Shear X",np.array([[1,0.5,0],[0,1,0],[0,0,1]])),
-            ("Shear Y",np.array([[1,0,0],[0.5,1,0],[0,0,1]])),
-            ("Reflect X",np.array([[-1,0,0],[0,1,0],[0,0,1]]))
-        ]
+        elif self.backend=="display_list":
+            glColor4f(*color)
+            glCallList(self._display_list(vertices,mode,cache_key,version))
 
-        for idx, (name,matrix) in enumerate(presets):
-            row=idx//3+1
-            col=idx%3
-            btn=ttk.Button(preset_frame, text=name,
-                           command=lambda m=matrix: self.set_matrix(m))
-            btn.grid(row=row,column=col,padx=5,pady=5,sticky='ew')
-        
-        button_frame=ttk.Frame(main_frame)
-        button_frame.grid(row=5,column=0, columnspan=3,pady=20)
+        elif self.backend=="vertex_array":
+            glColor4f(*color)
+            glEnableClientState(GL_VERTEX_ARRAY)
+            glVertexPointer(3,GL_FLOAT,0,vertices)
+            glDrawArrays(mode,0,len(vertices))
+            glDisableClientState(GL_VERTEX_ARRAY)
 
-        ttk.Button(button_frame, text="Apply Transformation",
-                   command=self.apply_matrix).grid(row=0,column=0,padx=5)
-        ttk.Button(button_frame, text="Reset to Identity",
-                   command=self.reset_matrix).grid(row=0,column=1,padx=5)
-        ttk.Button(button_frame, text="Close",
-                   command=self.close_gui).grid(row=0,column=2,padx=5)
+        else:
+            #vbo and shader backends share the buffer path
+            buffer_id,count=self._vertex_buffer(vertices,cache_key,version)
+            if self.program is not None:
+                glUseProgram(self.program)
+                glUniform4f(self.color_location,*color)
+            else:
+                glColor4f(*color)
+            glBindBuffer(GL_ARRAY_BUFFER,buffer_id)
+            glEnableClientState(GL_VERTEX_ARRAY)
+            glVertexPointer(3,GL_FLOAT,0,None)
+            glDrawArrays(mode,0,count)
+            glDisableClientState(GL_VERTEX_ARRAY)
+            glBindBuffer(GL_ARRAY_BUFFER,0)
+            if self.program is not None:
+                glUseProgram(0)
+
+    def _display_list(self, vertices, mode, cache_key, version):
+        entry=self.cache.get(cache_key)
+        if cache_key is not None and version is not None and entry and entry[0]==version:
+            return entry[1]
+
+        #uncached draws all share the list stored under the None key
+        list_id=entry[1] if entry else glGenLists(1)
+        glNewList(list_id,GL_COMPILE)
+        glBegin(mode)
+        for vertex in vertices:
+            glVertex3f(vertex[0],vertex[1],vertex[2])
+        glEnd()
+        glEndList()
+        self.cache[cache_key]=(version,list_id,len(vertices))
+        return list_id
+
+    def _vertex_buffer(self, vertices, cache_key, version):
+        entry=self.cache.get(cache_key)
+        if cache_key is not None and version is not None and entry and entry[0]==version:
+            return entry[1],entry[2]
+
+        buffer_id=entry[1] if entry else glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER,buffer_id)
+        if entry and entry[2]==len(vertices):
+            glBufferSubData(GL_ARRAY_BUFFER,0,vertices.nbytes,vertices)
+        else:
+            glBufferData(GL_ARRAY_BUFFER,vertices.nbytes,vertices,GL_DYNAMIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER,0)
+        self.cache[cache_key]=(version,buffer_id,len(vertices))
+        return buffer_id,len(vertices)
+
+    def release(self):
+        for version,handle,count in self.cache.values():
+            if self.backend=="display_list":
+                glDeleteLists(handle,1)
+            elif self.backend in ("vbo","shader"):
+                glDeleteBuffers(1,[handle])
+        self.cache={}
+        if self.program is not None:
+            glDeleteProgram(self.program)
+            self.program=None
+
+
+class RendererProbe:
+    """Checks what the GL driver offers and times each BatchRenderer backend.
+
+    The winner is cached per renderer string so the benchmark only runs the
+    first time the program starts on a given GPU/driver."""
+
+    CACHE_PATH=os.path.join(os.path.expanduser("~"),".cache",
+                            "linear-transformation-visualizer","renderer.json")
+
+    def __init__(self, cache_path=None):
+        self.cache_path=cache_path or self.CACHE_PATH
+        self.vendor=""
+        self.renderer=""
+        self.version=""
+        self.extensions=set()
+        self.timings={}
+
+    def read_capabilities(self):
+        def gl_string(name):
+            value=glGetString(name)
+            return value.decode(errors="replace") if value else ""
+
+        self.vendor=gl_string(GL_VENDOR)
+        self.renderer=gl_string(GL_RENDERER)
+        self.version=gl_string(GL_VERSION)
+        self.extensions=set(gl_string(GL_EXTENSIONS).split())
+
+    def gl_version(self):
+        #version strings look like "4.5 (Compatibility Profile) Mesa 23.0"
+        try:
+            major,minor=self.version.split()[0].split(".")[:2]
+            return int(major),int(minor)
+        except (IndexError, ValueError):
+            return 1,1
+
+    def available_backends(self):
+        version=self.gl_version()
+        backends=["immediate","display_list","vertex_array"]
+        if version>=(1,5) or "GL_ARB_vertex_buffer_object" in self.extensions:
+            backends.append("vbo")
+        if version>=(2,0) or {"GL_ARB_shader_objects","GL_ARB_vertex_shader",
+                               "GL_ARB_fragment_shader"}<=self.extensions:
+            backends.append("shader")
+        return backends
+
+    def supports_pbo(self):
+        return self.gl_version()>=(2,1) or "GL_ARB_pixel_buffer_object" in self.extensions
+
+    def supports_mipmap_generation(self):
+        return self.gl_version()>=(3,0) or bool({"GL_ARB_framebuffer_object",
+                                                 "GL_EXT_framebuffer_object"}&self.extensions)
+
+    def cache_key(self):
+        return f"{self.vendor}|{self.renderer}|{self.version}"
+
+    def load_cache(self):
+        try:
+            with open(self.cache_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_cache(self, backend):
+        cache=self.load_cache()
+        cache[self.cache_key()]={"backend":backend,"timings":self.timings}
+        try:
+            os.makedirs(os.path.dirname(self.cache_path),exist_ok=True)
+            with open(self.cache_path,"w") as f:
+                json.dump(cache,f,indent=2)
+        except OSError as e:
+            print(f"Could not save renderer cache: {e}")
+
+    def benchmark(self, backends, vertices, frames=20):
+        #half the frames redraw unchanged geometry, half re-upload it,
+        #matching a scene that is idle part of the time and animating otherwise
+        self.timings={}
+        for backend in backends:
+            try:
+                renderer=BatchRenderer(backend)
+                renderer.draw(vertices,cache_key="probe",version=0)
+                glFinish()
+
+                start=time.perf_counter()
+                for frame in range(frames):
+                    version=0 if frame<frames//2 else frame
+                    renderer.draw(vertices,cache_key="probe",version=version)
+                glFinish()
+                self.timings[backend]=time.perf_counter()-start
+
+                renderer.release()
+            except Exception as e:
+                print(f"Renderer backend '{backend}' failed the probe: {e}")
+
+        glClear(GL_COLOR_BUFFER_BIT|GL_DEPTH_BUFFER_BIT)
+        if not self.timings:
+            return "immediate"
+        return min(self.timings,key=self.timings.get)
+
+    def select(self, vertices, override=None, reprobe=False):
+        self.read_capabilities()
+        backends=self.available_backends()
+
+        if override:
+            if override not in backends:
+                print(f"Renderer '{override}' is not supported here, available: {', '.join(backends)}")
+            else:
+                return override
+
+        cached=self.load_cache().get(self.cache_key())
+        if cached and not reprobe and cached.get("backend") in backends:
+            self.timings=cached.get("timings",{})
+            return cached["backend"]
+
+        backend=self.benchmark(backends,vertices)
+        self.save_cache(backend)
+        return backend
+
+class NDimensionalMode:
+    """Hypercube and point set living in n dimensions (2<=n<=10).
+
+    Geometry is transformed by an n×n matrix and then projected to 3D. The
+    projection and the transform are fused into one 3×n matrix so every
+    frame is a single matrix product over all vertices."""
+
+    MIN_DIMENSION=2
+    MAX_DIMENSION=10
+
+    def __init__(self, dimension=4, point_count=4000, seed=0):
+        self.rng=np.random.default_rng(seed)
+        self.point_count=point_count
+
+        self.projection_angle=0.0
+        #radians per second the hidden axes rotate into view
+        self.projection_speed=0.4
+        self.auto_rotate=True
+        self.show_points=False
+
+        self.set_dimension(dimension)
+
+    def set_dimension(self, dimension):
+        n=max(self.MIN_DIMENSION,min(self.MAX_DIMENSION,dimension))
+        self.dimension=n
+
+        #vertex k of the unit hypercube has coordinate j equal to bit j of k
+        indices=np.arange(2**n)
+        self.vertices=((indices[:,None]>>np.arange(n))&1).astype(np.float32)
+
+        #every edge joins a vertex to the one with a single extra bit set,
+        #which gives n*2^(n-1) edges
+        starts=[]
+        ends=[]
+        for axis in range(n):
+            lower=indices[(indices>>axis)&1==0]
+            starts.append(lower)
+            ends.append(lower|(1<<axis))
+        self.edges=np.stack([np.concatenate(starts),np.concatenate(ends)],axis=1)
+
+        self.points=self.rng.normal(0.0,0.6,(self.point_count,n)).astype(np.float32)
+
+        self.original_matrix=np.eye(n)
+        self.transform_matrix=np.eye(n)
+        self.current_matrix=np.eye(n)
+        self.animation_progress=1.0
+        self.is_animating=False
+
+    def random_matrix(self):
+        #orthogonal part from a QR factorisation, then an uneven stretch
+        q,r=np.linalg.qr(self.rng.normal(size=(self.dimension,self.dimension)))
+        q=q*np.sign(np.diag(r))
+        return q@np.diag(self.rng.uniform(0.5,1.6,self.dimension))
 
-        info_text=("The unit cube will be positioned with one corner at origin (0,0,0)\n and externd to (1,1,1) in the first octant.\n The entire coordinate space will transform according to your matrix")
-        info_label=ttk.Label(main_frame, text=info_text,
-                             font=("Arial",10),foreground="gray")
-        info_label.grid(row=6,column=0,columnspan=3,pady=10)
+    def apply_transformation(self, matrix):
+        self.original_matrix=self.current_matrix.copy()
+        self.transform_matrix=np.asarray(matrix,dtype=float)
+        self.animation_progress=0.0
+        self.is_animating=True
+
+    def update(self, animation_step, dt, ease):
+        if self.auto_rotate:
+            self.projection_angle+=self.projection_speed*dt
+
+        if self.is_animating:
+            self.animation_progress+=animation_step
+            if self.animation_progress>=1.0:
+                self.animation_progress=1.0
+                self.is_animating=False
+            t=ease(self.animation_progress)
+            self.current_matrix=(1-t)*self.original_matrix+t*self.transform_matrix
+
+    def projection(self):
+        n=self.dimension
+        #base projection keeps x,y,z and lays the extra axes out on a cone
+        base=np.zeros((3,n))
+        base[:,:min(3,n)]=np.eye(3)[:,:min(3,n)]
+        for axis in range(3,n):
+            phi=2.4*axis
+            base[:,axis]=0.6*np.array([cos(phi),sin(phi),0.7])
+
+        #rotate in the (k, k+3) planes so hidden axes swing into view over time
+        rotation=np.eye(n)
+        c=cos(self.projection_angle)
+        s=sin(self.projection_angle)
+        for axis in range(min(3,n-3)):
+            a,b=axis,axis+3
+            rotation[a,a]=c
+            rotation[a,b]=-s
+            rotation[b,a]=s
+            rotation[b,b]=c
+        return base@rotation
+
+    def combined_matrix(self):
+        #3×n matrix doing the n-D transform then the projection
+        return self.projection()@self.current_matrix
+
+    def projected_edges(self):
+        combined=self.combined_matrix().astype(np.float32)
+        projected=self.vertices@combined.T
+        return projected[self.edges]
+
+    def projected_points(self):
+        return self.points@self.combined_matrix().astype(np.float32).T
+
+    def projected_axes(self, length=2.0):
+        combined=self.combined_matrix().astype(np.float32)
+        lines=np.zeros((self.dimension,2,3),dtype=np.float32)
+        lines[:,1]=length*combined.T
+        return lines
+
+    def determinant(self):
+        return np.linalg.det(self.current_matrix)
+
+
+class MatrixPowerCache:
+    """Computes A^k without k sequential multiplies.
+
+    Diagonalizable matrices use a cached eigendecomposition, A^k=V·diag(w^k)·V⁻¹.
+    Defective or badly conditioned ones fall back to repeated squaring over
+    cached A, A², A⁴, ..."""
+
+    #eigenvector matrices worse conditioned than this are treated as defective
+    MAX_CONDITION=1e8
+
+    def __init__(self, matrix):
+        self.matrix=np.asarray(matrix,dtype=float)
+        self.eigenvalues=None
+        self.eigenvectors=None
+        self.inverse_eigenvectors=None
+        self.squares=[self.matrix]
 
-        self.root.update_idletasks()
-        x=(self.root.winfo_screenwidth()//2)-(500//2)
-        y=(self.root.winfo_screenheight()//2)-(400//2)
-        self.root.geometry(f"500x400+{x}+{y}")
+        try:
+            eigenvalues,eigenvectors=np.linalg.eig(self.matrix)
+            if np.linalg.cond(eigenvectors)<self.MAX_CONDITION:
+                self.eigenvalues=eigenvalues
+                self.eigenvectors=eigenvectors
+                self.inverse_eigenvectors=np.linalg.inv(eigenvectors)
+        except np.linalg.LinAlgError:
+            pass
+
+    def is_diagonalizable(self):
+        return self.eigenvalues is not None
+
+    def spectral_radius(self):
+        return float(np.max(np.abs(np.linalg.eigvals(self.matrix))))
+
+    def real_eigenvectors(self):
+        #(eigenvalue, unit eigenvector) pairs for the real eigen-directions
+        eigenvalues,eigenvectors=np.linalg.eig(self.matrix)
+        pairs=[]
+        for value,vector in zip(eigenvalues,eigenvectors.T):
+            if abs(value.imag)<1e-9:
+                vector=vector.real
+                pairs.append((value.real,vector/np.linalg.norm(vector)))
+        return pairs
+
+    def power(self, k):
+        if k==0:
+            return np.eye(len(self.matrix))
+
+        if self.eigenvalues is not None:
+            with np.errstate(over="ignore",invalid="ignore"):
+                result=(self.eigenvectors*self.eigenvalues**k)@self.inverse_eigenvectors
+            return result.real
+
+        #binary exponentiation, keeping every square for later calls
+        result=np.eye(len(self.matrix))
+        bit=0
+        with np.errstate(over="ignore",invalid="ignore"):
+            while k:
+                if bit==len(self.squares):
+                    self.squares.append(self.squares[-1]@self.squares[-1])
+                if k&1:
+                    result=result@self.squares[bit]
+                k>>=1
+                bit+=1
+        return result
+
+
+class TrailBuffer:
+    """Fixed-size ring buffer of point positions mirrored in a GL vertex buffer.
+
+    Slot s holds one snapshot of all points in rows s*N:(s+1)*N, so each new
+    snapshot is a single contiguous glBufferSubData of N vertices."""
+
+    def __init__(self, slots, point_count):
+        self.slots=slots
+        self.point_count=point_count
+        self.data=np.zeros((slots*point_count,3),dtype=np.float32)
+        self.next_slot=0
+        self.filled=0
+        self.buffer_id=None
+        #slots written since the last upload, when the VBO exists
+        self.pending=[]
+
+    def clear(self):
+        self.next_slot=0
+        self.filled=0
+        self.pending=[]
+
+    def push(self, positions):
+        start=self.next_slot*self.point_count
+        self.data[start:start+self.point_count]=positions
+        self.pending.append(self.next_slot)
+        self.next_slot=(self.next_slot+1)%self.slots
+        self.filled=min(self.filled+1,self.slots)
+
+    def upload(self):
+        if self.buffer_id is None:
+            self.buffer_id=glGenBuffers(1)
+            glBindBuffer(GL_ARRAY_BUFFER,self.buffer_id)
+            glBufferData(GL_ARRAY_BUFFER,self.data.nbytes,self.data,GL_DYNAMIC_DRAW)
+            self.pending=[]
+            return
 
-        self.root.protocol("WM_DELETE_WINDOW",self.close_gui)
+        glBindBuffer(GL_ARRAY_BUFFER,self.buffer_id)
+        #only the last `slots` writes can still be live
+        for slot in dict.fromkeys(self.pending[-self.slots:]):
+            start=slot*self.point_count
+            chunk=self.data[start:start+self.point_count]
+            glBufferSubData(GL_ARRAY_BUFFER,start*12,chunk.nbytes,chunk)
+        self.pending=[]
 
+    def draw(self, use_vbo=True):
+        if self.filled==0:
+            return
+        count=self.filled*self.point_count
+
+        glEnableClientState(GL_VERTEX_ARRAY)
+        if use_vbo:
+            self.upload()
+            glVertexPointer(3,GL_FLOAT,0,None)
+            glDrawArrays(GL_POINTS,0,count)
+            glBindBuffer(GL_ARRAY_BUFFER,0)
+        else:
+            self.pending=[]
+            glVertexPointer(3,GL_FLOAT,0,self.data)
+            glDrawArrays(GL_POINTS,0,count)
+        glDisableClientState(GL_VERTEX_ARRAY)
+
+    def release(self):
+        if self.buffer_id is not None:
+            glDeleteBuffers(1,[self.buffer_id])
+            self.buffer_id=None
+
+
+class IteratedMapMode:
+    """Applies A over and over to a point cloud and keeps the trajectories.
+
+    Positions at step k are always p0·(A^k)ᵀ taken from MatrixPowerCache, so
+    there is no drift from chaining thousands of multiplies. A point that
+    would leave COORDINATE_LIMIT is frozen where it was, so k never grows
+    far enough for A^k to overflow."""
+
+    COORDINATE_LIMIT=1e4
+
+    def __init__(self, point_count=256, trail_length=1024, seed=1):
+        rng=np.random.default_rng(seed)
+        self.initial_points=rng.uniform(-2.0,2.0,(point_count,3))
+        self.trails=TrailBuffer(trail_length,point_count)
+        self.iterations_per_second=30.0
+        self.power_cache=MatrixPowerCache(np.eye(3))
+        self.reset()
+
+    def set_matrix(self, matrix):
+        self.power_cache=MatrixPowerCache(matrix)
+        self.reset()
+
+    def reset(self):
+        self.iteration=0
+        self.time_accumulator=0.0
+        self.trails.clear()
+        self.current_points=self.initial_points.astype(np.float32)
+        self.frozen=np.zeros(len(self.initial_points),dtype=bool)
+        self.trails.push(self.current_points)
+
+    def step_to(self, k):
+        #moves the points that are still inside the limit to step k
+        active=np.flatnonzero(~self.frozen)
+        if len(active)==0:
+            return
+        power=self.power_cache.power(k)
+        if not np.isfinite(power).all():
+            #only points with no unstable component get here; stop them too
+            self.frozen[:]=True
+            return
 
+        moved=self.initial_points[active]@power.T
+        #written as "not inside" so NaN rows count as escaped
+        escaped=~(np.abs(moved)<self.COORDINATE_LIMIT).all(axis=1)
+        self.frozen[active[escaped]]=True
+        points=self.current_points.copy()
+        points[active[~escaped]]=moved[~escaped]
+        self.current_points=points
+
+    def update(self, dt):
+        self.time_accumulator+=dt*self.iterations_per_second
+        steps=int(self.time_accumulator)
+        if steps==0:
+            return
+        self.time_accumulator-=steps
+
+        #a long stall would otherwise push more snapshots than the ring holds
+        first=max(self.iteration+1,self.iteration+steps-self.trails.slots+1)
+        for k in range(first,self.iteration+steps+1):
+            self.step_to(k)
+            self.trails.push(self.current_points)
+        self.iteration+=steps
+
+
+class MatrixFlow:
+    """The one-parameter group exp(tL) with L=log A, for animating along a flow.
+
+    Diagonalizable matrices keep V, V⁻¹ and log λ so exp(tL)=V·diag(e^(t·log λ))·V⁻¹
+    is a few 3×3 products per frame. Defective ones get L from inverse scaling
+    and squaring and are exponentiated with a short Taylor series instead.
+    Equal negative eigenvalues are paired up and given the branches +iπ and
+    −iπ on conjugate eigenvectors, which is a real rotation by π in their
+    plane. When A has no real logarithm (singular, or a negative eigenvalue
+    of odd multiplicity) has_flow is False and reason says why."""
+
+    def __init__(self, matrix):
+        self.matrix=np.asarray(matrix,dtype=float)
+        self.identity=np.eye(len(self.matrix))
+        self.generator=None
+        self.eigenvectors=None
+        self.inverse_eigenvectors=None
+        self.log_eigenvalues=None
+        self.has_flow=False
+        self.reason=""
+
+        if abs(np.linalg.det(self.matrix))<1e-10:
+            self.reason="singular matrix has no logarithm"
+            return
 
-    def set_matrix(self,matrix):
+        power_cache=MatrixPowerCache(self.matrix)
+        if power_cache.is_diagonalizable():
+            eigenvalues=power_cache.eigenvalues.astype(complex)
+            eigenvectors=power_cache.eigenvectors.astype(complex)
+            log_eigenvalues=np.log(eigenvalues)
+
+            #principal logs give every real negative eigenvalue +iπ, which is never
+            #real. Pair equal ones (a, b) and swap their eigenvectors for a±ib with
+            #branches ±iπ; that spans the same eigenspace and makes L real. A
+            #conjugate pair that only rounds to negative real (a rotation by π
+            #built from cos/sin) has complex eigenvectors and already gets ±iπ.
+            negative=[index for index in np.argsort(eigenvalues.real)
+                      if abs(eigenvalues[index].imag)<1e-9 and eigenvalues[index].real<0
+                      and np.abs(eigenvectors[:,index].imag).max()<1e-9]
+            if len(negative)%2:
+                self.reason="negative eigenvalue of odd multiplicity has no real logarithm"
+                return
+            for first,second in zip(negative[0::2],negative[1::2]):
+                if not np.isclose(eigenvalues[first].real,eigenvalues[second].real):
+                    self.reason="unpaired negative eigenvalues have no real logarithm"
+                    return
+                a=eigenvectors[:,first].real.copy()
+                b=eigenvectors[:,second].real.copy()
+                eigenvectors[:,first]=a+1j*b
+                eigenvectors[:,second]=a-1j*b
+                magnitude=np.log(abs(eigenvalues[first].real))
+                log_eigenvalues[first]=magnitude+1j*np.pi
+                log_eigenvalues[second]=magnitude-1j*np.pi
+
+            try:
+                inverse_eigenvectors=np.linalg.inv(eigenvectors)
+            except np.linalg.LinAlgError:
+                self.reason="eigenvectors are not independent"
+                return
+            generator=(eigenvectors*log_eigenvalues)@inverse_eigenvectors
+            if np.abs(generator.imag).max()>1e-9*(1+np.abs(generator).max()):
+                self.reason="negative eigenvalue has no real logarithm"
+                return
+            self.eigenvectors=eigenvectors
+            self.inverse_eigenvectors=inverse_eigenvectors
+            self.log_eigenvalues=log_eigenvalues
+            self.generator=generator.real
+        else:
+            try:
+                generator=self.logm(self.matrix)
+            except np.linalg.LinAlgError:
+                generator=None
+            if generator is None or not np.allclose(self.expm(generator),self.matrix,atol=1e-6):
+                self.reason="no real logarithm found"
+                return
+            self.generator=generator
+
+        self.has_flow=True
+
+    def at(self, t):
+        if not self.has_flow:
+            #no group to follow, so fall back to the straight-line blend
+            return (1-t)*self.identity+t*self.matrix
+        if self.log_eigenvalues is not None:
+            return ((self.eigenvectors*np.exp(t*self.log_eigenvalues))@self.inverse_eigenvectors).real
+        return self.expm(t*self.generator)
+
+    @staticmethod
+    def expm(matrix, terms=16):
+        #scaling and squaring around a Taylor series
+        norm=np.linalg.norm(matrix,1)
+        squarings=max(0,int(np.ceil(np.log2(norm)))+1) if norm>0.5 else 0
+        scaled=matrix/2**squarings
+        result=np.eye(len(matrix))
+        term=np.eye(len(matrix))
+        for k in range(1,terms+1):
+            term=term@scaled/k
+            result=result+term
+        for _ in range(squarings):
+            result=result@result
+        return result
+
+    @staticmethod
+    def sqrtm(matrix, iterations=50):
+        #Denman–Beavers iteration
+        y=matrix.copy()
+        z=np.eye(len(matrix))
+        for _ in range(iterations):
+            y,z=(y+np.linalg.inv(z))/2,(z+np.linalg.inv(y))/2
+            if np.allclose(y@y,matrix,atol=1e-13,rtol=1e-12):
+                break
+        return y
+
+    @classmethod
+    def logm(cls, matrix, terms=30):
+        #inverse scaling and squaring: take square roots until close to I,
+        #use the log(I+X) series there, then scale back up
+        identity=np.eye(len(matrix))
+        root=matrix.copy()
+        roots=0
+        while np.linalg.norm(root-identity,1)>0.25:
+            if roots==40:
+                return None
+            root=cls.sqrtm(root)
+            roots+=1
+
+        x=root-identity
+        result=np.zeros_like(matrix)
+        power=identity
+        for k in range(1,terms+1):
+            power=power@x
+            result=result+((-1)**(k+1))*power/k
+        return result*2**roots
+
+
+class ParticleField:
+    """Dense cloud of particles advected along a MatrixFlow.
+
+    Every particle is recomputed from its start position as p0·exp(τL)ᵀ, one
+    (N×3)·(3×3) product per frame, with τ cycling from 0 to 1."""
+
+    def __init__(self, count=200000, extent=3.0, seed=2):
+        rng=np.random.default_rng(seed)
+        self.initial_points=rng.uniform(-extent,extent,(count,3)).astype(np.float32)
+        self.current_points=self.initial_points.copy()
+        self.flow_time=0.0
+        #seconds for one pass from the identity to the full matrix
+        self.period=2.0
+        self.version=0
+
+    def advance(self, dt):
+        self.flow_time=(self.flow_time+dt/self.period)%1.0
+
+    def advect(self, flow):
+        #called once per drawn frame, however many time steps went by
+        step=flow.at(self.flow_time).astype(np.float32)
+        np.matmul(self.initial_points,step.T,out=self.current_points)
+        self.version+=1
+
+
+class StreamedTexture:
+    """Image decoded on a worker thread and uploaded to GL a few rows per frame.
+
+    pump() must be called from the GL thread; it allocates the texture once the
+    pixels are ready, then copies at most upload_budget bytes per call,
+    through a pixel buffer object when the driver has them. Mipmaps are built
+    after the last rows arrive."""
+
+    def __init__(self, path, max_size=4096, use_pbo=False, generate_mipmaps=False):
+        self.path=path
+        self.max_size=max_size
+        self.use_pbo=use_pbo
+        self.generate_mipmaps=generate_mipmaps
+
+        self.width=0
+        self.height=0
+        self.pixels=None
+        self.error=None
+        self.cancelled=False
+
+        self.texture_id=None
+        self.pbo_id=None
+        self.rows_uploaded=0
+        self.ready=False
+
+        self.loader=threading.Thread(target=self.decode)
+        self.loader.daemon=True
+        self.loader.start()
+
+    def decode(self):
+        try:
+            image=pygame.image.load(self.path)
+            width,height=image.get_size()
+            scale=min(1.0,self.max_size/max(width,height))
+            if scale<1.0:
+                width=max(1,int(width*scale))
+                height=max(1,int(height*scale))
+
+            #normalise to 32-bit RGBA so smoothscale and tostring behave the same for every file
+            surface=pygame.Surface(image.get_size(),pygame.SRCALPHA,32)
+            surface.blit(image,(0,0))
+            if scale<1.0:
+                surface=pygame.transform.smoothscale(surface,(width,height))
+
+            #flipped so row 0 is the bottom of the picture, as GL expects
+            pixels=pygame.image.tostring(surface,"RGBA",True)
+            if not self.cancelled:
+                self.width=width
+                self.height=height
+                self.pixels=pixels
+        except Exception as e:
+            self.error=str(e)
+
+    def memory_bytes(self):
+        #a full mip chain adds about a third on top of the base level
+        size=self.width*self.height*4
+        return size*4//3 if self.generate_mipmaps else size
+
+    def pump(self, upload_budget=4*1024*1024):
+        if self.ready or self.pixels is None or self.cancelled:
+            return self.ready
+
+        row_bytes=self.width*4
+        if self.texture_id is None:
+            self.texture_id=glGenTextures(1)
+            glBindTexture(GL_TEXTURE_2D,self.texture_id)
+            glPixelStorei(GL_UNPACK_ALIGNMENT,1)
+            glTexImage2D(GL_TEXTURE_2D,0,GL_RGBA,self.width,self.height,0,GL_RGBA,GL_UNSIGNED_BYTE,None)
+            glTexParameteri(GL_TEXTURE_2D,GL_TEXTURE_MIN_FILTER,GL_LINEAR)
+            glTexParameteri(GL_TEXTURE_2D,GL_TEXTURE_MAG_FILTER,GL_LINEAR)
+            glTexParameteri(GL_TEXTURE_2D,GL_TEXTURE_WRAP_S,GL_CLAMP_TO_EDGE)
+            glTexParameteri(GL_TEXTURE_2D,GL_TEXTURE_WRAP_T,GL_CLAMP_TO_EDGE)
+            if self.use_pbo:
+                self.pbo_id=glGenBuffers(1)
+
+        rows=max(1,min(self.height-self.rows_uploaded,upload_budget//row_bytes))
+        start=self.rows_uploaded*row_bytes
+        chunk=self.pixels[start:start+rows*row_bytes]
+
+        glBindTexture(GL_TEXTURE_2D,self.texture_id)
+        glPixelStorei(GL_UNPACK_ALIGNMENT,1)
+        if self.pbo_id is not None:
+            glBindBuffer(GL_PIXEL_UNPACK_BUFFER,self.pbo_id)
+            #fresh storage each tile so the driver never waits on the previous copy
+            glBufferData(GL_PIXEL_UNPACK_BUFFER,len(chunk),chunk,GL_STREAM_DRAW)
+            glTexSubImage2D(GL_TEXTURE_2D,0,0,self.rows_uploaded,self.width,rows,
+                            GL_RGBA,GL_UNSIGNED_BYTE,ctypes.c_void_p(0))
+            glBindBuffer(GL_PIXEL_UNPACK_BUFFER,0)
+        else:
+            glTexSubImage2D(GL_TEXTURE_2D,0,0,self.rows_uploaded,self.width,rows,
+                            GL_RGBA,GL_UNSIGNED_BYTE,chunk)
+        self.rows_uploaded+=rows
+
+        if self.rows_uploaded>=self.height:
+            if self.generate_mipmaps:
+                glGenerateMipmap(GL_TEXTURE_2D)
+                glTexParameteri(GL_TEXTURE_2D,GL_TEXTURE_MIN_FILTER,GL_LINEAR_MIPMAP_LINEAR)
+            self.release_staging()
+            self.ready=True
+        return self.ready
+
+    def release_staging(self):
+        #the decoded bytes live on the GPU now
+        self.pixels=None
+        if self.pbo_id is not None:
+            glDeleteBuffers(1,[self.pbo_id])
+            self.pbo_id=None
+
+    def release(self):
+        self.cancelled=True
+        self.release_staging()
+        if self.texture_id is not None:
+            glDeleteTextures(1,[self.texture_id])
+            self.texture_id=None
+        self.ready=False
+
+
+class TextureCache:
+    """Keeps recently shown StreamedTextures within a GPU memory budget.
+
+    Textures are evicted least recently used first when the total goes over
+    memory_budget, so swapping through many large images stays bounded."""
+
+    def __init__(self, memory_budget=256*1024*1024, max_size=4096, use_pbo=False, generate_mipmaps=False):
+        self.memory_budget=memory_budget
+        self.max_size=max_size
+        self.use_pbo=use_pbo
+        self.generate_mipmaps=generate_mipmaps
+        #path -> StreamedTexture, least recently used first
+        self.textures={}
+
+    def get(self, path):
+        texture=self.textures.pop(path,None)
+        if texture is None:
+            texture=StreamedTexture(path,self.max_size,self.use_pbo,self.generate_mipmaps)
+        self.textures[path]=texture
+        self.evict(keep=texture)
+        return texture
+
+    def memory_bytes(self):
+        return sum(texture.memory_bytes() for texture in self.textures.values())
+
+    def evict(self, keep=None):
+        for path in list(self.textures):
+            if self.memory_bytes()<=self.memory_budget:
+                break
+            if self.textures[path] is not keep:
+                self.textures.pop(path).release()
+
+    def release(self):
+        for texture in self.textures.values():
+            texture.release()
+        self.textures={}
+
+
+class TextTextureCache:
+    """Text rendered with pygame once and kept as GL textures.
+
+    Entries are keyed by (text, font, colour) and the least recently used
+    are deleted past max_entries, so a value being scrubbed doesn't pile up
+    a texture per frame."""
+
+    def __init__(self, max_entries=256):
+        self.max_entries=max_entries
+        #(text, font, color) -> (texture id, width, height), least recently used first
+        self.entries={}
+
+    def get(self, text, font, color):
+        key=(text,font,color)
+        entry=self.entries.pop(key,None)
+        if entry is None:
+            surface=font.render(text,True,color)
+            width,height=surface.get_size()
+            texture_id=glGenTextures(1)
+            glBindTexture(GL_TEXTURE_2D,texture_id)
+            glPixelStorei(GL_UNPACK_ALIGNMENT,1)
+            glTexImage2D(GL_TEXTURE_2D,0,GL_RGBA,width,height,0,GL_RGBA,GL_UNSIGNED_BYTE,
+                         pygame.image.tostring(surface,"RGBA",False))
+            glTexParameteri(GL_TEXTURE_2D,GL_TEXTURE_MIN_FILTER,GL_LINEAR)
+            glTexParameteri(GL_TEXTURE_2D,GL_TEXTURE_MAG_FILTER,GL_LINEAR)
+            entry=(texture_id,width,height)
+
+            if len(self.entries)>=self.max_entries:
+                oldest=next(iter(self.entries))
+                glDeleteTextures(1,[self.entries.pop(oldest)[0]])
+        self.entries[key]=entry
+        return entry
+
+    def draw(self, text, font, color, x, y, centered=False):
+        #(x, y) is the top left corner in screen pixels, or the centre when centered
+        texture_id,width,height=self.get(text,font,color)
+        if centered:
+            x-=width//2
+            y-=height//2
+        glEnable(GL_TEXTURE_2D)
+        glBindTexture(GL_TEXTURE_2D,texture_id)
+        glColor4f(1.0,1.0,1.0,1.0)
+        glBegin(GL_QUADS)
+        glTexCoord2f(0,0); glVertex2f(x,y)
+        glTexCoord2f(1,0); glVertex2f(x+width,y)
+        glTexCoord2f(1,1); glVertex2f(x+width,y+height)
+        glTexCoord2f(0,1); glVertex2f(x,y+height)
+        glEnd()
+        glDisable(GL_TEXTURE_2D)
+        return width,height
+
+    def release(self):
+        if self.entries:
+            glDeleteTextures(len(self.entries),[entry[0] for entry in self.entries.values()])
+        self.entries={}
+
+
+class MatrixEditor:
+    """3×3 matrix editor drawn inside the OpenGL window.
+
+    Drag an entry sideways to scrub it (hold shift for fine steps), use the
+    wheel over it to nudge it, or click it and type a value. Every change
+    calls on_change(matrix, live): live edits should show at once, preset
+    buttons ask for the usual animation."""
+
+    PRESETS=[
+        ("Identity",np.eye(3)),
+        ("Scale 2x",np.diag([2,2,2])),
+        ("Scale XY",np.diag([2,2,1])),
+        ("Rotate Z 90°",np.array([[0,-1,0],[1,0,0],[0,0,1]])),
+        ("Rotate Y 90°",np.array([[0,0,1],[0,1,0],[-1,0,0]])),
+        ("Rotate X 90°",np.array([[1,0,0],[0,0,-1],[0,1,0]])),
+        ("Shear X",np.array([[1,0.5,0],[0,1,0],[0,0,1]])),
+        ("Shear Y",np.array([[1,0,0],[0.5,1,0],[0,0,1]])),
+        ("Reflect X",np.array([[-1,0,0],[0,1,0],[0,0,1]]))
+    ]
+
+    CELL_WIDTH=100
+    CELL_HEIGHT=40
+    BUTTON_HEIGHT=30
+    PADDING=10
+
+    #value change per pixel dragged
+    DRAG_STEP=0.01
+    FINE_DRAG_STEP=0.001
+
+    def __init__(self, on_change, text_cache, font, small_font, x, y):
+        self.on_change=on_change
+        self.text_cache=text_cache
+        self.font=font
+        self.small_font=small_font
+        self.matrix=np.eye(3)
+        self.visible=True
+
+        self.dragging=None
+        self.drag_start_x=0
+        self.drag_start_value=0.0
+        self.drag_moved=False
+        self.hover=None
+        #cell being typed into, and the text typed so far
+        self.focus=None
+        self.typed=""
+
+        self.layout(x,y)
+
+    def layout(self, x, y):
+        pad=self.PADDING
+        self.cells={}
         for i in range(3):
             for j in range(3):
-                self.entries[i][j].delete(0,tk.END)
-                self.entries[i][j].insert(0,f"{matrix[i,j]:.3f}")
-    
-    def reset_matrix(self):
-        self.set_matrix(np.eye(3))
-
-    def apply_matrix(self):
+                self.cells[(i,j)]=pygame.Rect(x+pad+j*(self.CELL_WIDTH+pad),y+pad+30+i*(self.CELL_HEIGHT+pad),
+                                              self.CELL_WIDTH,self.CELL_HEIGHT)
+        buttons_top=y+pad+30+3*(self.CELL_HEIGHT+pad)+pad
+        self.buttons=[]
+        for idx,(name,matrix) in enumerate(self.PRESETS):
+            row=idx//3
+            col=idx%3
+            rect=pygame.Rect(x+pad+col*(self.CELL_WIDTH+pad),buttons_top+row*(self.BUTTON_HEIGHT+pad),
+                             self.CELL_WIDTH,self.BUTTON_HEIGHT)
+            self.buttons.append((rect,name,matrix))
+        width=3*self.CELL_WIDTH+4*pad
+        height=buttons_top-y+3*(self.BUTTON_HEIGHT+pad)+40
+        self.rect=pygame.Rect(x,y,width,height)
+
+    def cell_at(self, pos):
+        for key,rect in self.cells.items():
+            if rect.collidepoint(pos):
+                return key
+        return None
+
+    def set_matrix(self, matrix, live=False):
+        self.matrix=np.array(matrix,dtype=float)
+        self.on_change(self.matrix.copy(),live)
+
+    def set_entry(self, cell, value):
+        value=round(value,3)
+        if value!=self.matrix[cell]:
+            self.matrix[cell]=value
+            self.on_change(self.matrix.copy(),True)
+
+    def commit_typed(self):
         try:
-            matrix=np.zeros((3,3))
-            for i in range(3):
-                for j in range(3):
-                    value=float(self.entries[i][j].get())
-                    matrix[i,j]=value
-                
-            #checking if the matrix is invertible
-            det=np.linalg.det(matrix)
-            if abs(det)<1e-10:
-                messagebox.showwarning("Warning",
-                    f"Matrix is not invertible (determinant={det:.6f})\n"
-                    "The transformation will collapse the space")
-                
-            self.callback(matrix)
-            messagebox.showinfo("Sucess", "Transformation applied!")
-
+            value=float(self.typed)
         except ValueError:
-            messagebox.showerror("Error","Invalid matrix values. Please enter valid numbers")
+            value=None
+        #"1e999" parses as inf, which would poison every eigen-solve downstream
+        if value is not None and math.isfinite(value):
+            self.set_entry(self.focus,value)
+        self.focus=None
+        self.typed=""
+
+    def handle_event(self, event):
+        #returns True when the editor used the event
+        if not self.visible:
+            return False
+
+        if event.type==MOUSEMOTION:
+            self.hover=self.cell_at(event.pos)
+            if self.dragging is None:
+                return False  #hover is tracked but the motion still reaches the scene
+            dx=event.pos[0]-self.drag_start_x
+            if dx:
+                self.drag_moved=True
+            step=self.FINE_DRAG_STEP if pygame.key.get_mods()&KMOD_SHIFT else self.DRAG_STEP
+            self.set_entry(self.dragging,self.drag_start_value+dx*step)
+            return True
 
-        except Exception as e:
-            messagebox.showerror("Error",f"Error applying matrix")
+        if event.type==MOUSEBUTTONDOWN:
+            if not self.rect.collidepoint(event.pos):
+                if self.focus is not None:
+                    self.commit_typed()
+                return False
+            cell=self.cell_at(event.pos)
+            if cell is not None and event.button==1:
+                if self.focus is not None and self.focus!=cell:
+                    self.commit_typed()
+                self.dragging=cell
+                self.drag_start_x=event.pos[0]
+                self.drag_start_value=self.matrix[cell]
+                self.drag_moved=False
+            elif cell is not None and event.button in (4,5):
+                self.set_entry(cell,self.matrix[cell]+(0.1 if event.button==4 else -0.1))
+            elif event.button==1:
+                for rect,name,matrix in self.buttons:
+                    if rect.collidepoint(event.pos):
+                        self.focus=None
+                        self.set_matrix(matrix)
+            return True
+
+        if event.type==MOUSEBUTTONUP and self.dragging is not None:
+            if event.button==1:
+                #a click without a drag starts typing into the cell
+                if not self.drag_moved:
+                    self.focus=self.dragging
+                    self.typed=""
+                self.dragging=None
+            return True
+
+        if event.type==KEYDOWN and self.focus is not None:
+            if event.key in (K_RETURN,K_KP_ENTER):
+                self.commit_typed()
+            elif event.key==K_ESCAPE:
+                self.focus=None
+                self.typed=""
+            elif event.key==K_TAB:
+                i,j=self.focus
+                self.commit_typed()
+                self.focus=((i+(j+1)//3)%3,(j+1)%3)
+            elif event.key==K_BACKSPACE:
+                self.typed=self.typed[:-1]
+            elif event.unicode and event.unicode in "0123456789.-+eE":
+                self.typed+=event.unicode
+            return True
+
+        return False
+
+    def draw(self):
+        #expects a pixel orthographic projection with depth testing off
+        def fill(rect, color):
+            glColor4f(*color)
+            glBegin(GL_QUADS)
+            glVertex2f(rect.left,rect.top)
+            glVertex2f(rect.right,rect.top)
+            glVertex2f(rect.right,rect.bottom)
+            glVertex2f(rect.left,rect.bottom)
+            glEnd()
+
+        def outline(rect, color):
+            glColor4f(*color)
+            glBegin(GL_LINE_LOOP)
+            glVertex2f(rect.left,rect.top)
+            glVertex2f(rect.right,rect.top)
+            glVertex2f(rect.right,rect.bottom)
+            glVertex2f(rect.left,rect.bottom)
+            glEnd()
 
+        def centered(text, font, color, rect):
+            self.text_cache.draw(text,font,color,rect.centerx,rect.centery,centered=True)
+
+        glLineWidth(1)
+        fill(self.rect,(0.0,0.0,0.0,0.78))
+        outline(self.rect,(0.4,0.8,1.0,1.0))
+        self.text_cache.draw("TRANSFORMATION MATRIX",self.font,(255,255,255),
+                             self.rect.left+self.PADDING,self.rect.top+self.PADDING)
+
+        for cell,rect in self.cells.items():
+            if cell==self.dragging or cell==self.focus:
+                fill(rect,(0.2,0.35,0.55,1.0))
+            elif cell==self.hover:
+                fill(rect,(0.15,0.25,0.4,1.0))
+            else:
+                fill(rect,(0.1,0.15,0.25,1.0))
+            outline(rect,(0.4,0.6,0.8,1.0))
+            text=self.typed+"_" if cell==self.focus else f"{self.matrix[cell]:.3f}"
+            centered(text,self.font,(255,255,255),rect)
+
+        for rect,name,matrix in self.buttons:
+            selected=np.allclose(self.matrix,matrix)
+            fill(rect,(0.25,0.4,0.25,1.0) if selected else (0.18,0.18,0.22,1.0))
+            outline(rect,(0.5,0.5,0.6,1.0))
+            centered(name,self.small_font,(230,230,230),rect)
+
+        det=np.linalg.det(self.matrix)
+        if abs(det)<1e-10:
+            status=("Not invertible: the space collapses",(255,90,90))
+        else:
+            status=("Drag to scrub, shift for fine, click to type",(160,160,160))
+        self.text_cache.draw(status[0],self.small_font,status[1],
+                             self.rect.left+self.PADDING,self.rect.bottom-25)
+
+
+class TransparencySorter:
+    """Back-to-front order for translucent faces, cached per camera direction.
+
+    The camera's yaw and pitch are snapped into buckets of bucket_degrees. The
+    order for a bucket is worked out once, with a single argsort of the face
+    centres along the bucket's view direction, and reused until the camera
+    moves into another bucket or the faces themselves change."""
+
+    def __init__(self, bucket_degrees=15):
+        self.bucket_degrees=bucket_degrees
+        #bucket -> face order, valid for self.centroids
+        self.orders={}
+        self.centroids=None
+        self.sorts=0
+
+    def bucket(self, camera_angle_x, camera_angle_y):
+        return (int(round(camera_angle_x/self.bucket_degrees)),
+                int(round((camera_angle_y%360)/self.bucket_degrees))%int(round(360/self.bucket_degrees)))
+
+    def view_direction(self, bucket):
+        #unit vector from the origin towards the eye, same angles as set_camera
+        x_c_angle=math.radians(bucket[0]*self.bucket_degrees)
+        y_c_angle=math.radians(bucket[1]*self.bucket_degrees)
+        return np.array([cos(x_c_angle)*sin(y_c_angle),sin(x_c_angle),cos(x_c_angle)*cos(y_c_angle)])
+
+    def order(self, faces, camera_angle_x, camera_angle_y):
+        #faces is (F, corners, 3); returns face indices, farthest first
+        centroids=faces.mean(axis=1)
+        if self.centroids is None or self.centroids.shape!=centroids.shape or not np.array_equal(self.centroids,centroids):
+            self.orders={}
+            self.centroids=centroids
+
+        bucket=self.bucket(camera_angle_x,camera_angle_y)
+        order=self.orders.get(bucket)
+        if order is None:
+            order=np.argsort(centroids@self.view_direction(bucket),kind="stable")
+            self.orders[bucket]=order
+            self.sorts+=1
+        return order
+
+
+class GlyphAtlas:
+    """Every glyph of a font rasterized once into a single texture.
+
+    layout() turns a list of strings into quad corners relative to each
+    label's anchor plus matching texture coordinates, all with NumPy, and
+    draw() sends any number of labels to GL as one vertex array."""
+
+    CHARACTERS="".join(chr(code) for code in range(32,127))+"λ"
+    ATLAS_WIDTH=512
+
+    def __init__(self, font, characters=CHARACTERS):
+        characters=sorted(set(characters))
+        surfaces=[font.render(character,True,(255,255,255)) for character in characters]
+        self.glyph_height=max(surface.get_height() for surface in surfaces)
+
+        #pack glyphs left to right in rows of glyph_height
+        positions=[]
+        x=0
+        y=0
+        for surface in surfaces:
+            if x+surface.get_width()>self.ATLAS_WIDTH:
+                x=0
+                y+=self.glyph_height
+            positions.append((x,y))
+            x+=surface.get_width()
+        self.atlas_height=y+self.glyph_height
+
+        atlas=pygame.Surface((self.ATLAS_WIDTH,self.atlas_height),pygame.SRCALPHA,32)
+        for surface,position in zip(surfaces,positions):
+            atlas.blit(surface,position)
+        self.pixels=pygame.image.tostring(atlas,"RGBA",False)
+        self.texture_id=None
+
+        self.codes=np.array([ord(character) for character in characters])
+        self.advances=np.array([surface.get_width() for surface in surfaces],dtype=np.float32)
+        positions=np.array(positions,dtype=np.float32)
+        self.uv=np.stack([positions[:,0]/self.ATLAS_WIDTH,
+                          positions[:,1]/self.atlas_height,
+                          (positions[:,0]+self.advances)/self.ATLAS_WIDTH,
+                          (positions[:,1]+self.glyph_height)/self.atlas_height],axis=1)
+        self.fallback=int(np.searchsorted(self.codes,ord("?")))
+
+    def glyph_indices(self, codes):
+        indices=np.minimum(np.searchsorted(self.codes,codes),len(self.codes)-1)
+        return np.where(self.codes[indices]==codes,indices,self.fallback)
+
+    def layout(self, texts):
+        #returns (corner offsets (Q*4, 2), texcoords (Q*4, 2), label index per quad, label widths)
+        lengths=np.array([len(text) for text in texts],dtype=int)
+        codes=np.frombuffer("".join(texts).encode("utf-32-le"),dtype=np.uint32).astype(np.int64)
+        glyphs=self.glyph_indices(codes)
+        labels=np.repeat(np.arange(len(texts)),lengths)
+
+        advances=self.advances[glyphs]
+        #x of each glyph inside its own label: running total minus the label's starting total
+        before=np.concatenate([[0.0],np.cumsum(advances)])
+        label_starts=np.cumsum(lengths)-lengths
+        left=before[:-1]-np.repeat(before[label_starts],lengths)
+        right=left+advances
+        top=np.zeros_like(left)
+        bottom=top+self.glyph_height
+
+        offsets=np.stack([np.stack([left,top],axis=1),np.stack([right,top],axis=1),
+                          np.stack([right,bottom],axis=1),np.stack([left,bottom],axis=1)],axis=1)
+        uv=self.uv[glyphs]
+        texcoords=np.stack([uv[:,[0,1]],uv[:,[2,1]],uv[:,[2,3]],uv[:,[0,3]]],axis=1)
+        widths=np.bincount(labels,weights=advances,minlength=len(texts))
+        return offsets.astype(np.float32),texcoords.astype(np.float32),labels,widths
+
+    def upload(self):
+        self.texture_id=glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D,self.texture_id)
+        glPixelStorei(GL_UNPACK_ALIGNMENT,1)
+        glTexImage2D(GL_TEXTURE_2D,0,GL_RGBA,self.ATLAS_WIDTH,self.atlas_height,0,
+                     GL_RGBA,GL_UNSIGNED_BYTE,self.pixels)
+        glTexParameteri(GL_TEXTURE_2D,GL_TEXTURE_MIN_FILTER,GL_NEAREST)
+        glTexParameteri(GL_TEXTURE_2D,GL_TEXTURE_MAG_FILTER,GL_NEAREST)
+
+    def draw(self, vertices, texcoords, colors):
+        #vertices (V, 2) in screen pixels, colors (V, 4); one draw call for everything
+        if len(vertices)==0:
+            return
+        if self.texture_id is None:
+            self.upload()
+
+        glEnable(GL_TEXTURE_2D)
+        glBindTexture(GL_TEXTURE_2D,self.texture_id)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_TEXTURE_COORD_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+        glVertexPointer(2,GL_FLOAT,0,np.ascontiguousarray(vertices,dtype=np.float32))
+        glTexCoordPointer(2,GL_FLOAT,0,np.ascontiguousarray(texcoords,dtype=np.float32))
+        glColorPointer(4,GL_FLOAT,0,np.ascontiguousarray(colors,dtype=np.float32))
+        glDrawArrays(GL_QUADS,0,len(vertices))
+        glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_TEXTURE_COORD_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+        glDisable(GL_TEXTURE_2D)
+
+    def release(self):
+        if self.texture_id is not None:
+            glDeleteTextures(1,[self.texture_id])
+            self.texture_id=None
+
+
+class GeometryExporter:
+    """Writes transformed geometry to binary PLY, glTF/GLB or compressed NPZ.
+
+    parts is a list of (name, vertices, edges, faces) in original coordinates;
+    edges=None means consecutive vertex pairs (how grid lines are stored) and
+    faces are triangles or None. Vertices are transformed and written
+    CHUNK_VERTICES at a time, so no transformed copy of the whole scene is
+    ever held in memory."""
+
+    CHUNK_VERTICES=1<<18
+
+    def __init__(self, parts):
+        self.parts=parts
+        self.vertex_count=sum(len(vertices) for name,vertices,edges,faces in parts)
+        self.edge_count=sum(len(vertices)//2 if edges is None else len(edges)
+                            for name,vertices,edges,faces in parts)
+        self.face_count=sum(0 if faces is None else len(faces) for name,vertices,edges,faces in parts)
+
+    def vertex_chunks(self, matrix):
+        transform=np.asarray(matrix,dtype=float).T
+        for name,vertices,edges,faces in self.parts:
+            for start in range(0,len(vertices),self.CHUNK_VERTICES):
+                yield (vertices[start:start+self.CHUNK_VERTICES]@transform).astype("<f4")
+
+    def edge_chunks(self):
+        offset=0
+        for name,vertices,edges,faces in self.parts:
+            if edges is None:
+                for start in range(0,len(vertices)//2,self.CHUNK_VERTICES):
+                    first=offset+2*np.arange(start,min(start+self.CHUNK_VERTICES,len(vertices)//2))
+                    yield np.stack([first,first+1],axis=1).astype("<u4")
+            else:
+                for start in range(0,len(edges),self.CHUNK_VERTICES):
+                    yield (np.asarray(edges[start:start+self.CHUNK_VERTICES])+offset).astype("<u4")
+            offset+=len(vertices)
+
+    def face_chunks(self):
+        offset=0
+        for name,vertices,edges,faces in self.parts:
+            if faces is not None:
+                for start in range(0,len(faces),self.CHUNK_VERTICES):
+                    yield (np.asarray(faces[start:start+self.CHUNK_VERTICES])+offset).astype("<u4")
+            offset+=len(vertices)
+
+    def bounds(self, matrix):
+        low=np.full(3,np.inf)
+        high=np.full(3,-np.inf)
+        for chunk in self.vertex_chunks(matrix):
+            low=np.minimum(low,chunk.min(axis=0))
+            high=np.maximum(high,chunk.max(axis=0))
+        return low,high
+
+    def write(self, path, matrices):
+        #one matrix writes one file; several write an animation. NPZ keeps every
+        #frame in one archive, PLY and glTF get a numbered file per frame.
+        extension=os.path.splitext(path)[1].lower()
+        if extension==".npz":
+            self.write_npz(path,matrices)
+            return [path]
+
+        writers={".ply":self.write_ply,".glb":self.write_gltf,".gltf":self.write_gltf}
+        if extension not in writers:
+            raise ValueError(f"Unsupported export format: {extension}")
+        if len(matrices)==1:
+            writers[extension](path,matrices[0])
+            return [path]
+
+        stem=os.path.splitext(path)[0]
+        paths=[]
+        for frame,matrix in enumerate(matrices):
+            frame_path=f"{stem}_{frame:04d}{extension}"
+            writers[extension](frame_path,matrix)
+            paths.append(frame_path)
+        return paths
+
+    def write_ply(self, path, matrix):
+        header=["ply","format binary_little_endian 1.0",
+                "comment exported by Linear Transformations Visualizer",
+                f"element vertex {self.vertex_count}",
+                "property float x","property float y","property float z",
+                f"element edge {self.edge_count}",
+                "property int vertex1","property int vertex2",
+                f"element face {self.face_count}",
+                "property list uchar int vertex_indices",
+                "end_header"]
+        face_dtype=np.dtype([("count","u1"),("indices","<i4",(3,))])
+
+        with open(path,"wb") as f:
+            f.write(("\n".join(header)+"\n").encode("ascii"))
+            for chunk in self.vertex_chunks(matrix):
+                f.write(chunk.tobytes())
+            for chunk in self.edge_chunks():
+                f.write(chunk.astype("<i4").tobytes())
+            for chunk in self.face_chunks():
+                faces=np.empty(len(chunk),dtype=face_dtype)
+                faces["count"]=3
+                faces["indices"]=chunk
+                f.write(faces.tobytes())
+
+    def write_gltf(self, path, matrix):
+        #.glb puts the JSON and the binary buffer in one file, .gltf writes a .bin beside it
+        low,high=self.bounds(matrix)
+        positions_size=self.vertex_count*12
+        edges_size=self.edge_count*8
+        faces_size=self.face_count*12
+        buffer_size=positions_size+edges_size+faces_size
+        binary=path.lower().endswith(".glb")
+
+        buffer={"byteLength":buffer_size}
+        if not binary:
+            bin_path=os.path.splitext(path)[0]+".bin"
+            buffer["uri"]=os.path.basename(bin_path)
+
+        primitives=[{"attributes":{"POSITION":0},"indices":1,"mode":1}]
+        buffer_views=[{"buffer":0,"byteOffset":0,"byteLength":positions_size,"target":34962},
+                      {"buffer":0,"byteOffset":positions_size,"byteLength":edges_size,"target":34963}]
+        accessors=[{"bufferView":0,"componentType":5126,"count":self.vertex_count,"type":"VEC3",
+                    "min":low.tolist(),"max":high.tolist()},
+                   {"bufferView":1,"componentType":5125,"count":self.edge_count*2,"type":"SCALAR"}]
+        if self.face_count:
+            buffer_views.append({"buffer":0,"byteOffset":positions_size+edges_size,
+                                 "byteLength":faces_size,"target":34963})
+            accessors.append({"bufferView":2,"componentType":5125,"count":self.face_count*3,"type":"SCALAR"})
+            primitives.append({"attributes":{"POSITION":0},"indices":2,"mode":4})
+
+        document={
+            "asset":{"version":"2.0","generator":"Linear Transformations Visualizer"},
+            "scene":0,
+            "scenes":[{"nodes":[0]}],
+            "nodes":[{"mesh":0}],
+            "meshes":[{"primitives":primitives}],
+            "buffers":[buffer],
+            "bufferViews":buffer_views,
+            "accessors":accessors,
+        }
+
+        def write_buffer(f):
+            for chunk in self.vertex_chunks(matrix):
+                f.write(chunk.tobytes())
+            for chunk in self.edge_chunks():
+                f.write(chunk.tobytes())
+            for chunk in self.face_chunks():
+                f.write(chunk.tobytes())
+
+        if not binary:
+            with open(path,"w") as f:
+                json.dump(document,f)
+            with open(bin_path,"wb") as f:
+                write_buffer(f)
+            return
+
+        #GLB chunks are padded to 4 bytes, JSON with spaces and binary with zeros
+        json_bytes=json.dumps(document).encode("utf-8")
+        json_bytes+=b" "*(-len(json_bytes)%4)
+        bin_padding=-buffer_size%4
+        total=12+8+len(json_bytes)+8+buffer_size+bin_padding
+        with open(path,"wb") as f:
+            f.write(struct.pack("<4sII",b"glTF",2,total))
+            f.write(struct.pack("<I4s",len(json_bytes),b"JSON"))
+            f.write(json_bytes)
+            f.write(struct.pack("<I4s",buffer_size+bin_padding,b"BIN\0"))
+            write_buffer(f)
+            f.write(b"\0"*bin_padding)
+
+    def write_npz(self, path, matrices):
+        #same layout np.savez_compressed makes, but each array is streamed into
+        #the zip entry chunk by chunk
+        matrices=[np.asarray(matrix,dtype=float) for matrix in matrices]
+
+        def write_array(archive, name, dtype, shape, chunks):
+            with archive.open(name+".npy","w",force_zip64=True) as f:
+                np.lib.format.write_array_header_2_0(f,{"descr":np.dtype(dtype).str,
+                                                       "fortran_order":False,"shape":shape})
+                for chunk in chunks:
+                    f.write(np.ascontiguousarray(chunk,dtype=dtype).tobytes())
+
+        def frames():
+            for matrix in matrices:
+                yield from self.vertex_chunks(matrix)
+
+        with zipfile.ZipFile(path,"w",compression=zipfile.ZIP_DEFLATED,allowZip64=True) as archive:
+            if len(matrices)==1:
+                write_array(archive,"positions","<f4",(self.vertex_count,3),self.vertex_chunks(matrices[0]))
+            else:
+                write_array(archive,"positions","<f4",(len(matrices),self.vertex_count,3),frames())
+            write_array(archive,"edges","<u4",(self.edge_count,2),self.edge_chunks())
+            write_array(archive,"faces","<u4",(self.face_count,3),self.face_chunks())
+            write_array(archive,"matrices","<f8",(len(matrices),3,3),[np.array(matrices)])
+
+            #which rows of positions belong to which part, as [start, stop) vertex ranges
+            ranges=[]
+            start=0
+            for name,vertices,edges,faces in self.parts:
+                ranges.append((start,start+len(vertices)))
+                start+=len(vertices)
+            write_array(archive,"part_ranges","<i8",(len(ranges),2),[np.array(ranges)])
+            names=np.array([name for name,vertices,edges,faces in self.parts])
+            write_array(archive,"part_names",names.dtype.str,names.shape,[names])
+
+
+class FramePacer:
+    """Frame scheduler: fixed-step updates driven by the monotonic clock.
+
+    wait_for_frame() sleeps until the next frame is due (when max_fps is set),
+    then returns how many update_step-sized steps of simulated time have
+    passed, so animation speed no longer depends on how fast frames are drawn,
+    and the leftover fraction of a step, for drawing between two steps.
+    A capped frame that starts after its deadline counts as late; whole frame
+    intervals skipped over count as dropped."""
+
+    #more than this many steps in one frame means we fell behind; the rest is discarded
+    MAX_STEPS_PER_FRAME=15
+
+    def __init__(self, max_fps=60, update_rate=120):
+        self.update_step=1.0/update_rate
+        self.frame_interval=1.0/max_fps if max_fps>0 else 0.0
+
+        self.accumulator=0.0
+        self.last_time=None
+        self.next_frame_time=None
+
+        self.frames=0
+        self.late_frames=0
+        self.dropped_frames=0
+        self.fps=0.0
+
+    def wait_for_frame(self):
+        now=time.perf_counter()
+        if self.frame_interval and self.next_frame_time is not None:
+            remaining=self.next_frame_time-now
+            if remaining>0.002:
+                #sleep is coarse, so wake a little early and spin the rest
+                time.sleep(remaining-0.002)
+            while time.perf_counter()<self.next_frame_time:
+                pass
+            now=time.perf_counter()
+
+            lateness=now-self.next_frame_time
+            if lateness>self.frame_interval:
+                self.late_frames+=1
+                self.dropped_frames+=int(lateness/self.frame_interval)
+                #start a fresh schedule instead of rushing to catch up
+                self.next_frame_time=now+self.frame_interval
+            else:
+                if lateness>0.001:
+                    self.late_frames+=1
+                self.next_frame_time+=self.frame_interval
+        elif self.frame_interval:
+            self.next_frame_time=now+self.frame_interval
+
+        if self.last_time is not None:
+            elapsed=now-self.last_time
+            self.accumulator+=elapsed
+            if elapsed>0:
+                self.fps=0.9*self.fps+0.1/elapsed if self.fps else 1.0/elapsed
+        self.last_time=now
+        self.frames+=1
+
+        steps=int(self.accumulator/self.update_step)
+        self.accumulator-=steps*self.update_step
+        if steps>self.MAX_STEPS_PER_FRAME:
+            steps=self.MAX_STEPS_PER_FRAME
+            self.accumulator=0.0
+        return steps,self.accumulator/self.update_step
 
-    def close_gui(self):
-        if self.root:
-            self.root.destroy()
-            self.root=None
-    
-    def show(self):
-        self.create_gui()
-        self.root.mainloop()
 
 class LinearTransformationVisualizer:
-    def __init__(self):
+    #incremental geometry updates allowed between full recomputes
+    FULL_RETRANSFORM_INTERVAL=64
+    #where a label's top left corner sits relative to its point, in pixels
+    LABEL_OFFSET=np.array([6.0,-18.0])
+    #how close, in world units, the mouse ray must pass to a plane the matrix has flattened
+    PICK_TOLERANCE=0.05
+
+    #defining cube faces
+    CUBE_FACES=np.array([
+        [0,1,2,3],
+        [4,5,6,7],
+        [0,1,5,4],
+        [2,3,7,6],
+        [0,3,7,4],
+        [1,2,6,5]
+    ])
+
+    CUBE_EDGES=np.array([
+        [0, 1], [1, 2], [2, 3], [3, 0],  # bottom face
+        [4, 5], [5, 6], [6, 7], [7, 4],  # top face
+        [0, 4], [1, 5], [2, 6], [3, 7]   # vertical edges
+    ])
+
+    def __init__(self, renderer=None, reprobe=False, particle_count=200000, image_paths=None,
+                 max_fps=60, update_rate=120):
         self.width=1400
         self.height=900
 
@@ -140,19 +1599,26 @@ class LinearTransformationVisualizer:
         self.camera_angle_x=25
         self.camera_angle_y=45
         
-        self.animation_speed=0.015
+        #animation progress per second, a full transformation takes about 1.1 s
+        self.animation_speed=0.9
         self.animation_progress=0
         self.is_animating=False
+        #set when a new animation starts; update_geometry also rebuilds whenever the
+        #progress it draws at (geometry_progress) moves
+        self.geometry_stale=False
+        self.geometry_progress=0.0
 
         self.original_cube=np.array([
             [0,0,0],[1,0,0],[1,1,0],[0,1,0],
             [0,0,1],[1,0,1],[1,1,1],[0,1,1]
         ])
 
-        self.transformed_cube=self.original_cube.copy()
+        self.transformed_cube=self.original_cube.astype(float)
         self.current_cube=self.original_cube.copy()
 
         self.transform_matrix=np.eye(3)
+        #matrix actually on screen at the current point of the animation
+        self.current_matrix=np.eye(3)
         self.original_determinant=1.0
         self.transformed_determinant=1.0
 
@@ -160,8 +1626,10 @@ class LinearTransformationVisualizer:
         self.grid_spacing=1
         
         self.original_grid_lines=self.generate_grid_lines()
-        self.transformed_grid_lines=self.original_grid_lines.copy()
+        self.transformed_grid_lines=self.original_grid_lines.astype(float)
         self.current_grid_lines=self.original_grid_lines.copy()
+        #bumped whenever current_grid_lines changes so cached GPU copies refresh
+        self.grid_version=0
 
         #original basis vectors
         self.original_basis=np.array([
@@ -170,14 +1638,66 @@ class LinearTransformationVisualizer:
             [0,0,2]
         ])
 
-        self.transformed_basis=self.original_basis.copy()
+        self.transformed_basis=self.original_basis.astype(float)
         self.current_basis=self.original_basis.copy()
 
+        #rank-1 updates applied since the last full recompute, see retransform_geometry
+        self.incremental_updates=0
+
         self.mouse_drag=False
         self.last_mouse_pos=[0,0]
-
-        self.gui=None
-        self.gui_thread=None
+        self.frame_pacer=FramePacer(max_fps=max_fps,update_rate=update_rate)
+
+        #back-to-front order of the cube's translucent faces
+        self.face_sorter=TransparencySorter()
+        #faces queued by draw_cube, drawn by draw_translucent_pass once the opaque scene is done
+        self.translucent_faces=[]
+
+        #coordinate labels on lattice points, basis tips and eigenvectors, toggled with L
+        self.show_labels=False
+        self.glyph_atlas=None
+        self.lattice_points=self.generate_lattice_points()
+        self.lattice_layout=None
+        self.visible_label_count=0
+
+        #hover inspection, toggled with H
+        self.show_hover=False
+        self.hover_pos=None
+        self.hover_pick=None
+        self.scene_modelview=np.eye(4)
+        self.scene_projection=np.eye(4)
+
+        #n-dimensional hypercube mode, toggled with N
+        self.nd_mode=NDimensionalMode()
+        self.show_nd=False
+
+        #repeated application of transform_matrix to a point cloud, toggled with I
+        self.iterated_map=IteratedMapMode()
+        self.show_iterated_map=False
+
+        #animate along exp(tL) instead of the straight-line blend, toggled with F
+        self.flow=MatrixFlow(np.eye(3))
+        self.particles=ParticleField(particle_count)
+        self.flow_mode=False
+
+        #picture carried along by the transformation, toggled with T
+        bundled_images=sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)),"images","*.png")))
+        self.image_paths=list(image_paths or [])+bundled_images
+        self.image_index=0
+        self.show_image=False
+        self.texture_cache=None
+
+        #in-window matrix editor, created once fonts exist
+        self.matrix_editor=None
+        self.text_cache=None
+        #latest (matrix, live) from the editor, applied once per frame by apply_pending_edit
+        self.pending_edit=None
+
+        #drawing backend, picked by RendererProbe once the GL context exists
+        self.renderer_override=renderer
+        self.reprobe=reprobe
+        self.renderer_backend="immediate"
+        self.batch_renderer=None
 
     def generate_grid_lines(self):
         lines=[]
@@ -208,6 +1728,16 @@ class LinearTransformationVisualizer:
 
         return np.array(lines)
     
+    def generate_lattice_points(self):
+        #integer points of the three coordinate planes the grid is drawn on
+        values=np.arange(-self.grid_size,self.grid_size+1,self.grid_spacing)
+        a,b=np.meshgrid(values,values,indexing="ij")
+        a=a.ravel()
+        b=b.ravel()
+        zero=np.zeros_like(a)
+        planes=[np.stack([a,b,zero],axis=1),np.stack([a,zero,b],axis=1),np.stack([zero,a,b],axis=1)]
+        return np.unique(np.concatenate(planes),axis=0)
+
     def init_pygame(self):
         pygame.init()
         pygame.font.init()
@@ -218,6 +1748,11 @@ class LinearTransformationVisualizer:
         self.font = pygame.font.Font(None, 24)
         self.small_font = pygame.font.Font(None, 18)
 
+        self.text_cache=TextTextureCache()
+        self.glyph_atlas=GlyphAtlas(self.small_font)
+        self.matrix_editor=MatrixEditor(self.on_editor_change,self.text_cache,self.font,self.small_font,
+                                        self.width-350,10)
+
         glEnable(GL_DEPTH_TEST)
         glEnable(GL_BLEND)
         glBlendFunc(GL_SRC_ALPHA,GL_ONE_MINUS_SRC_ALPHA)
@@ -233,6 +1768,29 @@ class LinearTransformationVisualizer:
         #defining the object and the camera
         glMatrixMode(GL_MODELVIEW)
 
+        self.init_renderer()
+
+    def init_renderer(self):
+        #benchmark on a lattice a few times denser than the default grid
+        probe_vertices=np.tile(self.original_grid_lines.reshape(-1,3),(8,1))
+        probe=RendererProbe()
+        backend=probe.select(probe_vertices,override=self.renderer_override,reprobe=self.reprobe)
+
+        try:
+            self.batch_renderer=BatchRenderer(backend)
+        except Exception as e:
+            print(f"Renderer '{backend}' could not start ({e}), using immediate mode")
+            backend="immediate"
+            self.batch_renderer=BatchRenderer(backend)
+        self.renderer_backend=backend
+
+        self.texture_cache=TextureCache(max_size=min(4096,glGetIntegerv(GL_MAX_TEXTURE_SIZE)),
+                                        use_pbo=probe.supports_pbo(),
+                                        generate_mipmaps=probe.supports_mipmap_generation())
+
+        print(f"Renderer: {probe.renderer} (OpenGL {probe.version})")
+        print(f"Drawing backend: {backend}")
+
     def set_camera(self):
         glLoadIdentity()
 
@@ -270,12 +1828,8 @@ class LinearTransformationVisualizer:
         # glEnd()
 
         #drawing transformed grid linesss
-        glColor4f(0.6,0.8,1.0,0.8)
-        glBegin(GL_LINES)
-        for line in self.current_grid_lines:
-            glVertex3f(line[0][0],line[0][1],line[0][2])
-            glVertex3f(line[1][0],line[1][1],line[1][2])
-        glEnd()
+        self.batch_renderer.draw(self.current_grid_lines,GL_LINES,(0.6,0.8,1.0,0.8),
+                                 cache_key="grid",version=self.grid_version)
 
              # highlighting the coordinate axes
         basis_vectors = self.current_basis
@@ -313,43 +1867,15 @@ class LinearTransformationVisualizer:
 
     def draw_cube(self, vertices, color=(0.5,0.8,1),alpha=0.7,wireframe=False):
 
-        #defining cube faces
-        faces=[
-            [0,1,2,3],
-            [4,5,6,7],
-            [0,1,5,4],
-            [2,3,7,6],
-            [0,3,7,4],
-            [1,2,6,5]
-        ]
+        faces=self.CUBE_FACES
 
         if not wireframe:
             
-            #drawing semi-transparent cube faces
-            glColor4f(color[0],color[1],color[2],alpha)
-            glBegin(GL_QUADS)
-            #draws the whole cube
-            for face in faces:
-                #draws each face
-                for vertex in face:
-                    x_coordinate=vertices[vertex][0]
-                    y_coordinate=vertices[vertex][1]
-                    z_coordinate=vertices[vertex][2]
-                    
-                    glVertex3f(x_coordinate,y_coordinate,z_coordinate)
-
-            glEnd()
-
-        
             #draw cube edges
             glColor3f(color[0]*0.7,color[1]*0.7,color[2]*0.7)
             glLineWidth(2)
 
-            edges=[
-                [0, 1], [1, 2], [2, 3], [3, 0],  # bottom face
-                [4, 5], [5, 6], [6, 7], [7, 4],  # top face
-                [0, 4], [1, 5], [2, 6], [3, 7]   # vertical edges
-            ]
+            edges=self.CUBE_EDGES
 
             glBegin(GL_LINES)
             for edge in edges:
@@ -369,45 +1895,270 @@ class LinearTransformationVisualizer:
                 glVertex3f(x,y,z)
             glEnd()
 
-    def apply_transformation(self,matrix):
+            #semi-transparent cube faces wait for the translucent pass
+            self.translucent_faces.append((np.asarray(vertices)[faces],color,alpha,self.face_sorter))
+
+    def draw_translucent_pass(self):
+        #runs after points, trails, particles and the hover highlight have
+        #written depth, so the faces blend over them instead of under
+        for faces,color,alpha,sorter in self.translucent_faces:
+            self.draw_translucent_faces(faces,color,alpha,sorter)
+        self.translucent_faces=[]
+
+    def draw_translucent_faces(self, faces, color, alpha, sorter):
+        #faces is (F, 4, 3). Drawn back to front without depth writes so the
+        #result no longer depends on face order or camera angle.
+        order=sorter.order(faces,self.camera_angle_x,self.camera_angle_y)
+
+        glDepthMask(GL_FALSE)
+        self.batch_renderer.draw(faces[order],GL_QUADS,(color[0],color[1],color[2],alpha))
+        glDepthMask(GL_TRUE)
+
+    def apply_transformation(self,matrix,animate=True):
         #applying transformation matrix to cube, grid and basis vectors
+        matrix=np.asarray(matrix,dtype=float)
+        self.retransform_geometry(matrix)
         self.transform_matrix=matrix
-        
-        #transforming cube vertices
-        self.transformed_cube=np.array([matrix@vertex for vertex in self.original_cube])
-        
-        #transforming basis
-        self.transformed_basis=np.array([matrix@basis for basis in self.original_basis])
-        
-        #transforming grid
-        self.transformed_grid_lines=np.array([
-            [matrix@line[0],matrix@line[1]] for line in self.original_grid_lines
-        ])
-        
+        self.iterated_map.set_matrix(matrix)
+        self.flow=MatrixFlow(matrix)
+
+        self.grid_version+=1
+
         #calculate determinants
         self.original_determinant=np.linalg.det(np.eye(3))
         self.transformed_determinant=np.linalg.det(matrix)
 
-        #start animation
-        self.animation_progress=0
-        self.is_animating=True
+        if animate:
+            #start animation
+            self.animation_progress=0
+            self.is_animating=True
+            self.geometry_stale=True
+        else:
+            #live edits jump straight to the result
+            self.animation_progress=1.0
+            self.geometry_stale=False
+            self.geometry_progress=1.0
+            self.is_animating=False
+            self.current_matrix=np.array(matrix,dtype=float)
+            self.current_cube=self.transformed_cube
+            self.current_basis=self.transformed_basis
+            self.current_grid_lines=self.transformed_grid_lines
+
+    def retransform_geometry(self,matrix):
+        #a rank-1 change u·vᵀ moves every point x by u·(v·x), so patch the arrays
+        #instead of multiplying again. Scrubbing one entry Aᵢⱼ by δ only adds δ·xⱼ
+        #to coordinate i.
+        delta=matrix-self.transform_matrix
+        changed=np.argwhere(delta!=0)
+        if len(changed)==0:
+            return
+
+        geometry=[("transformed_cube",self.original_cube),
+                  ("transformed_basis",self.original_basis),
+                  ("transformed_grid_lines",self.original_grid_lines)]
+
+        #rounding errors add up with every patch, so start clean now and then
+        if self.incremental_updates<self.FULL_RETRANSFORM_INTERVAL and np.linalg.matrix_rank(delta)==1:
+            if len(changed)==1:
+                i,j=changed[0]
+                for name,original in geometry:
+                    getattr(self,name)[...,i]+=delta[i,j]*original[...,j]
+            else:
+                i,j=np.unravel_index(np.argmax(np.abs(delta)),delta.shape)
+                column=delta[:,j]
+                row=delta[i,:]/delta[i,j]
+                for name,original in geometry:
+                    getattr(self,name)[...]+=(original@row)[...,None]*column
+            self.incremental_updates+=1
+            return
+
+        for name,original in geometry:
+            setattr(self,name,original@matrix.T)
+        self.incremental_updates=0
+
+    def matrix_at(self,progress):
+        #matrix on screen at a given animation progress, matching update_geometry
+        t=self.ease_in_out(progress)
+        if self.flow_mode and self.flow.has_flow:
+            return self.flow.at(t)
+        return (1-t)*np.eye(3)+t*self.transform_matrix
+
+    def export_parts(self):
+        #geometry in original coordinates; quads are split into two triangles
+        quads=self.CUBE_FACES
+        cube_triangles=np.concatenate([quads[:,[0,1,2]],quads[:,[0,2,3]]])
+        basis_vertices=np.vstack([np.zeros(3),self.original_basis])
+        return [
+            ("grid",self.original_grid_lines.reshape(-1,3).astype(float),None,None),
+            ("cube",self.original_cube.astype(float),self.CUBE_EDGES,cube_triangles),
+            ("basis",basis_vertices.astype(float),np.array([[0,1],[0,2],[0,3]]),None),
+        ]
+
+    def export_geometry(self,path,frames=1):
+        """Write the grid, cube and basis to path (.ply, .glb, .gltf or .npz).
+
+        frames=1 exports what is on screen now; more frames samples the whole
+        animation from the identity to transform_matrix. Returns the written paths."""
+        if frames<=1:
+            matrices=[self.current_matrix]
+        else:
+            matrices=[self.matrix_at(frame/(frames-1)) for frame in range(frames)]
+        directory=os.path.dirname(path)
+        if directory:
+            os.makedirs(directory,exist_ok=True)
+        return GeometryExporter(self.export_parts()).write(path,matrices)
+
+    def export_from_keyboard(self,animation):
+        stamp=time.strftime("%Y%m%d-%H%M%S")
+        try:
+            if animation:
+                paths=self.export_geometry(os.path.join("exports",f"animation-{stamp}.npz"),frames=60)
+            else:
+                paths=[]
+                for extension in (".ply",".glb",".npz"):
+                    paths+=self.export_geometry(os.path.join("exports",f"transform-{stamp}{extension}"))
+            print("Exported "+", ".join(paths))
+        except OSError as e:
+            print(f"Export failed: {e}")
+
+    def on_editor_change(self,matrix,live):
+        #several drag or wheel events can land in one frame; keep only the latest
+        self.pending_edit=(matrix,live)
+
+    def apply_pending_edit(self):
+        #called once per frame, so the caches are rebuilt at frame rate at most
+        if self.pending_edit is None:
+            return
+        matrix,live=self.pending_edit
+        self.pending_edit=None
+        self.apply_transformation(matrix,animate=not live)
+
+    def update_animation(self,dt):
+        #advances the clocks by dt seconds of animation time, once per fixed step;
+        #the geometry itself is rebuilt by update_geometry once per drawn frame
+        if self.show_nd:
+            self.nd_mode.update(self.animation_speed*dt,dt,self.ease_in_out)
+        if self.show_iterated_map:
+            self.iterated_map.update(dt)
+        if self.flow_mode:
+            self.particles.advance(dt)
 
-    def update_animation(self):
         if self.is_animating:
-            self.animation_progress+=self.animation_speed
+            self.animation_progress+=self.animation_speed*dt
         
             if self.animation_progress>=1.0:
                 self.animation_progress=1.0
                 self.is_animating=False
 
-            t=self.ease_in_out(self.animation_progress)
-
+    def update_geometry(self,lookahead=0.0):
+        #evaluates the animated cube, basis and grid for the drawn frame, lookahead
+        #seconds past the last fixed step so frames between steps still move
+        progress=self.animation_progress
+        if self.is_animating:
+            progress=min(progress+self.animation_speed*lookahead,1.0)
+        if not self.geometry_stale and progress==self.geometry_progress:
+            return
+        self.geometry_stale=False
+        self.geometry_progress=progress
+        t=self.ease_in_out(progress)
+
+        if self.flow_mode and self.flow.has_flow:
+            #follow exp(tL) so rotations stay rigid on the way
+            step=self.flow.at(t)
+            self.current_matrix=step
+            self.current_cube=self.original_cube@step.T
+            self.current_basis=self.original_basis@step.T
+            self.current_grid_lines=self.original_grid_lines@step.T
+        else:
+            self.current_matrix=(1-t)*np.eye(3)+t*self.transform_matrix
             #animation of cube vertices
             self.current_cube=(1-t)*self.original_cube + t*self.transformed_cube
             #animation of basis vectors
             self.current_basis=(1-t)*self.original_basis+t*self.transformed_basis
             #animation of grid lines
             self.current_grid_lines=(1-t)*self.original_grid_lines+t*self.transformed_grid_lines
+        self.grid_version+=1
+
+    def draw_nd_scene(self):
+        nd=self.nd_mode
+
+        glLineWidth(2)
+        axes=nd.projected_axes()
+        for axis,line in enumerate(axes):
+            #spread the axis colours around the hue circle
+            hue=axis/nd.dimension
+            color=(0.5+0.5*cos(2*math.pi*hue),
+                   0.5+0.5*cos(2*math.pi*(hue-1/3)),
+                   0.5+0.5*cos(2*math.pi*(hue-2/3)))
+            self.batch_renderer.draw(line,GL_LINES,color)
+
+        glLineWidth(1)
+        self.batch_renderer.draw(nd.projected_edges(),GL_LINES,(1.0,0.6,0.2,0.6))
+
+        if nd.show_points:
+            glPointSize(2)
+            self.batch_renderer.draw(nd.projected_points(),GL_POINTS,(0.6,0.8,1.0,0.5))
+
+    def draw_iterated_map(self):
+        iterated=self.iterated_map
+
+        #eigen-directions: green shrinks, red grows, yellow is neutral
+        glLineWidth(2)
+        for value,vector in iterated.power_cache.real_eigenvectors():
+            if abs(abs(value)-1.0)<1e-6:
+                color=(1.0,1.0,0.3)
+            elif abs(value)<1.0:
+                color=(0.3,1.0,0.5)
+            else:
+                color=(1.0,0.3,0.3)
+            line=np.array([-vector,vector])*self.grid_size
+            self.batch_renderer.draw(line,GL_LINES,color)
+
+        glPointSize(1)
+        glColor4f(0.8,0.5,1.0,0.35)
+        iterated.trails.draw(use_vbo=self.renderer_backend in ("vbo","shader"))
+
+        glPointSize(4)
+        self.batch_renderer.draw(iterated.current_points,GL_POINTS,(1.0,0.9,1.0,1.0))
+
+    def draw_image_plane(self):
+        if not self.image_paths:
+            return
+        texture=self.texture_cache.get(self.image_paths[self.image_index])
+        texture.pump()
+        self.texture_cache.evict(keep=texture)
+
+        #fit the picture inside the unit square, keeping its aspect ratio
+        width,height=1.0,1.0
+        if texture.width and texture.height:
+            if texture.width>texture.height:
+                height=texture.height/texture.width
+            else:
+                width=texture.width/texture.height
+        corners=np.array([[0,0,0],[width,0,0],[width,height,0],[0,height,0]])@self.current_matrix.T
+        texture_coords=[(0,0),(1,0),(1,1),(0,1)]
+
+        if not texture.ready:
+            #outline where the picture will appear while it streams in
+            glLineWidth(1)
+            self.batch_renderer.draw(corners[[0,1,1,2,2,3,3,0]],GL_LINES,(1.0,1.0,1.0,0.5))
+            return
+
+        glEnable(GL_TEXTURE_2D)
+        glBindTexture(GL_TEXTURE_2D,texture.texture_id)
+        glColor4f(1.0,1.0,1.0,1.0)
+        glBegin(GL_QUADS)
+        for (u,v),corner in zip(texture_coords,corners):
+            glTexCoord2f(u,v)
+            glVertex3f(corner[0],corner[1],corner[2])
+        glEnd()
+        glDisable(GL_TEXTURE_2D)
+
+    def draw_particles(self):
+        self.particles.advect(self.flow)
+        glPointSize(1)
+        self.batch_renderer.draw(self.particles.current_points,GL_POINTS,(0.5,1.0,0.8,0.25),
+                                 cache_key="particles",version=self.particles.version)
 
     #smooth ease in function
     def ease_in_out(self,t):
@@ -424,6 +2175,10 @@ class LinearTransformationVisualizer:
         elif not np.allclose(self.transform_matrix, np.eye(3)):
             current_determinant = self.transformed_determinant
         
+        if self.show_nd:
+            nd = self.nd_mode
+            current_determinant = nd.determinant()
+
         volume_scale = abs(current_determinant)
         if abs(current_determinant) < 1e-10:
             transform_type = "SINGULAR (Non-invertible)"
@@ -441,19 +2196,6 @@ class LinearTransformationVisualizer:
         animation_status = "ANIMATING" if self.is_animating else "STATIC"
         animation_progress_percent = self.animation_progress * 100
         
-        # Create a pygame surface for the text overlay
-        panel_width = 450
-        panel_height = 300
-        text_surface = pygame.Surface((panel_width, panel_height), pygame.SRCALPHA)
-        
-        # Draw panel background
-        pygame.draw.rect(text_surface, (0, 0, 0, 200), (0, 0, panel_width, panel_height))
-        pygame.draw.rect(text_surface, (100, 200, 255), (0, 0, panel_width, panel_height), 2)
-        
-        # Render text lines
-        y = 20
-        line_spacing = 25
-        
         text_lines = [
             ("LINEAR TRANSFORMATION VISUALIZER", self.font, (255, 255, 255)),
             ("", None, None),  # Empty line
@@ -466,12 +2208,55 @@ class LinearTransformationVisualizer:
             (f"Type: {transform_type}", self.font, type_color),
             ("", None, None),  # Empty line
             (f"Animation: ({animation_progress_percent:.1f}%)", self.font, (100, 255, 255)),
+            (f"Renderer: {self.renderer_backend}   FPS: {self.frame_pacer.fps:.0f}   "
+             f"late: {self.frame_pacer.late_frames}   dropped: {self.frame_pacer.dropped_frames}",
+             self.small_font, (180, 180, 180)),
+        ])
+        if self.show_iterated_map:
+            spectral_radius = self.iterated_map.power_cache.spectral_radius()
+            stability = "stable" if spectral_radius < 1.0 else "unstable" if spectral_radius > 1.0 else "neutral"
+            text_lines.append((f"Iteration k={self.iterated_map.iteration}  radius {spectral_radius:.3f} ({stability})",
+                               self.small_font, (220, 160, 255)))
+        if self.flow_mode:
+            flow_text = "Flow: exp(tL)" if self.flow.has_flow else f"Flow: linear blend ({self.flow.reason})"
+            text_lines.append((flow_text, self.small_font, (120, 255, 200)))
+        if self.show_image and self.image_paths:
+            image_name = os.path.basename(self.image_paths[self.image_index])
+            texture = self.texture_cache.textures.get(self.image_paths[self.image_index])
+            if texture and texture.error:
+                image_status = f"failed: {texture.error}"
+            elif texture and not texture.ready and texture.height:
+                image_status = f"loading {100 * texture.rows_uploaded // texture.height}%"
+            elif texture and not texture.ready:
+                image_status = "decoding"
+            else:
+                image_status = f"{self.texture_cache.memory_bytes() / 2**20:.0f} MB on GPU"
+            text_lines.append((f"Image: {image_name} ({image_status})", self.small_font, (255, 255, 200)))
+        if self.show_nd:
+            text_lines.append((f"{nd.dimension}-D mode: {len(nd.vertices)} vertices, {len(nd.edges)} edges",
+                               self.small_font, (255, 200, 100)))
+        text_lines.extend([
             ("", None, None),  # Empty line
             ("CONTROLS:", self.font, (200, 200, 200)),
-            ("G - Toggle Animation", self.small_font, (180, 180, 180)),
+            ("G - Matrix editor   R - Reset", self.small_font, (180, 180, 180)),
+            ("N - n-D mode   [ ] - Dimension   M - Random matrix", self.small_font, (180, 180, 180)),
+            ("I - Iterate A^k on a point cloud   F - Flow along exp(tL)", self.small_font, (180, 180, 180)),
+            ("T - Warp an image   TAB - Next image   L - Labels   H - Hover", self.small_font, (180, 180, 180)),
             ("ESC - Exit", self.small_font, (180, 180, 180)),
         ])
         
+        # Create a pygame surface for the text overlay, tall enough for every line
+        y = 20
+        line_spacing = 25
+        panel_width = 450
+        panel_height = y * 2 + sum(line_spacing if text else line_spacing // 2 for text, _, _ in text_lines)
+        text_surface = pygame.Surface((panel_width, panel_height), pygame.SRCALPHA)
+        
+        # Draw panel background
+        pygame.draw.rect(text_surface, (0, 0, 0, 200), (0, 0, panel_width, panel_height))
+        pygame.draw.rect(text_surface, (100, 200, 255), (0, 0, panel_width, panel_height), 2)
+        
+        # Render text lines
         for text, font, color in text_lines:
             if text and font and color:
                 text_render = font.render(text, True, color)
@@ -544,6 +2329,7 @@ class LinearTransformationVisualizer:
                 self.mouse_drag=False
     
     def handle_mouse_motion(self, event):
+        self.hover_pos=event.pos if self.show_hover and not self.mouse_drag else None
         if self.mouse_drag:
             current_pos = event.pos
             dx = current_pos[0] - self.last_mouse_pos[0]
@@ -557,34 +2343,261 @@ class LinearTransformationVisualizer:
             
             self.last_mouse_pos = current_pos
 
-    def show_matrix_gui(self):
-        # Check if GUI is already running
-        if self.gui_thread and self.gui_thread.is_alive():
+    def begin_overlay(self):
+        #same pixel-space overlay setup as the info panel, y pointing down
+        glMatrixMode(GL_PROJECTION)
+        glPushMatrix()
+        glLoadIdentity()
+        glOrtho(0, self.width, self.height, 0, -1, 1)
+        glMatrixMode(GL_MODELVIEW)
+        glPushMatrix()
+        glLoadIdentity()
+        glDisable(GL_DEPTH_TEST)
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+
+    def end_overlay(self):
+        glEnable(GL_DEPTH_TEST)
+        glPopMatrix()
+        glMatrixMode(GL_PROJECTION)
+        glPopMatrix()
+        glMatrixMode(GL_MODELVIEW)
+
+    def draw_matrix_editor(self):
+        if not self.matrix_editor.visible:
+            return
+        self.begin_overlay()
+        self.matrix_editor.draw()
+        self.end_overlay()
+
+    def capture_scene_matrices(self):
+        #keep the camera of the frame on screen so mouse handling needn't query GL
+        self.scene_modelview=np.array(glGetDoublev(GL_MODELVIEW_MATRIX)).reshape(4,4).T
+        self.scene_projection=np.array(glGetDoublev(GL_PROJECTION_MATRIX)).reshape(4,4).T
+
+    def mouse_ray(self, x, y):
+        #world space origin and direction of the ray under pixel (x, y)
+        inverse=np.linalg.inv(self.scene_projection@self.scene_modelview)
+        ndc_x=2.0*x/self.width-1.0
+        ndc_y=1.0-2.0*y/self.height
+        near=inverse@np.array([ndc_x,ndc_y,-1.0,1.0])
+        far=inverse@np.array([ndc_x,ndc_y,1.0,1.0])
+        near=near[:3]/near[3]
+        far=far[:3]/far[3]
+        return near,far-near
+
+    def pick(self, x, y):
+        """Find the grid point under pixel (x, y) in constant time.
+
+        The grid is the three coordinate planes mapped by the matrix on
+        screen, so the mouse ray is intersected with each mapped plane
+        directly: for the plane with in-plane axes a and b, solving
+        [A·e_a | A·e_b | -d]·(u, v, s) = o gives the ray distance s and the
+        pre-image u·e_a + v·e_b in one 3×3 solve. A plane the matrix squashes
+        flat is solved by least squares and only counts when the ray passes
+        within PICK_TOLERANCE of it. The nearest plane hit is rounded to the
+        lattice. Returns None when the ray misses the grid, otherwise a dict
+        with the pre-image hit, the nearest lattice point, its image, the
+        plane (0 for x=0, 1 for y=0, 2 for z=0), the nearest grid line as
+        (axis it runs along, its fixed coordinates) and whether the pre-image
+        is unique (False for singular matrices)."""
+        origin,direction=self.mouse_ray(x,y)
+        matrix=self.current_matrix
+        exact=bool(abs(np.linalg.det(matrix))>1e-10)
+
+        best=None
+        for plane in range(3):
+            a,b=[axis for axis in range(3) if axis!=plane]
+            system=np.column_stack([matrix[:,a],matrix[:,b],-direction])
+            if np.linalg.matrix_rank(system)==3:
+                u,v,distance=np.linalg.solve(system,origin)
+            else:
+                (u,v,distance),_,_,_=np.linalg.lstsq(system,origin,rcond=None)
+                if np.linalg.norm(system@np.array([u,v,distance])-origin)>self.PICK_TOLERANCE:
+                    continue
+            if distance<=0 or (best is not None and distance>=best[0]):
+                continue
+            hit=np.zeros(3)
+            hit[a]=u
+            hit[b]=v
+            if np.all(np.abs(hit)<=self.grid_size):
+                best=(distance,plane,hit)
+        if best is None:
+            return None
+
+        distance,plane,hit=best
+        lattice_point=np.round(hit/self.grid_spacing)*self.grid_spacing
+        #of the two in-plane axes, the line runs along the one we are farther from a whole value on
+        in_plane=[axis for axis in range(3) if axis!=plane]
+        offsets=np.abs(hit-lattice_point)
+        along=in_plane[0] if offsets[in_plane[0]]>offsets[in_plane[1]] else in_plane[1]
+        fixed=lattice_point.copy()
+        fixed[along]=0.0
+
+        return {
+            "preimage":hit,
+            "lattice_point":lattice_point,
+            "image":self.current_matrix@lattice_point,
+            "plane":plane,
+            "line":(along,fixed),
+            "exact":exact,
+        }
+
+    def draw_hover(self):
+        if self.hover_pos is None:
+            self.hover_pick=None
+            return
+        self.hover_pick=self.pick(*self.hover_pos)
+        if self.hover_pick is None:
             return
-        #gui_callback = a function that responds to gui events
-        def gui_callback(matrix):
-            self.apply_transformation(matrix)
-
-        #create gui
-        self.gui=MatrixInputGUI(gui_callback)
-        #prepare to run gui in a thread
-        self.gui_thread=threading.Thread(target=self.gui.show)
-        #marks the gui as a background task
-        self.gui_thread.daemon=True
-        #start the gui as a thread
-        self.gui_thread.start()
+        picked=self.hover_pick
+
+        #highlight the nearest grid line and lattice point where they are now
+        along,fixed=picked["line"]
+        line=np.array([fixed,fixed])
+        line[0][along]=-self.grid_size
+        line[1][along]=self.grid_size
+        glLineWidth(3)
+        self.batch_renderer.draw(line@self.current_matrix.T,GL_LINES,(1.0,1.0,0.4,0.9))
+        glPointSize(10)
+        self.batch_renderer.draw(picked["image"],GL_POINTS,(1.0,1.0,1.0,1.0))
+
+    def draw_hover_readout(self):
+        #text part of draw_hover, drawn as an overlay after the translucent pass
+        if self.hover_pick is None:
+            return
+        picked=self.hover_pick
+        point=picked["lattice_point"]
+        image=picked["image"]
+        texts=[f"pre-image ({point[0]:.0f},{point[1]:.0f},{point[2]:.0f})",
+               f"image ({image[0]:.2f},{image[1]:.2f},{image[2]:.2f})"]
+        if not picked["exact"]:
+            texts.append("singular: pre-image not unique")
+
+        offsets,texcoords,labels,widths=self.glyph_atlas.layout(texts)
+        rows=np.array([[16.0,16.0+line_number*(self.glyph_atlas.glyph_height+2)] for line_number in range(len(texts))])
+        vertices=(offsets+(np.array(self.hover_pos,dtype=float)+rows[labels])[:,None,:]).reshape(-1,2)
+        colors=np.tile([1.0,1.0,0.6,1.0],(len(vertices),1))
+        self.begin_overlay()
+        self.glyph_atlas.draw(vertices,texcoords.reshape(-1,2),colors)
+        self.end_overlay()
+
+    def project_to_screen(self, points):
+        #world points (N, 3) -> pixel positions (N, 2) with y down, clip w and an on-screen mask.
+        #uses whatever camera is loaded, so call it while the scene matrices are set
+        modelview=np.array(glGetDoublev(GL_MODELVIEW_MATRIX)).reshape(4,4).T
+        projection=np.array(glGetDoublev(GL_PROJECTION_MATRIX)).reshape(4,4).T
+        homogeneous=np.hstack([points,np.ones((len(points),1))])
+        clip=homogeneous@(projection@modelview).T
+
+        depth=clip[:,3]
+        in_front=depth>1e-6
+        ndc=clip[:,:2]/np.where(in_front,depth,1.0)[:,None]
+        screen=np.stack([(ndc[:,0]+1)*0.5*self.width,(1-ndc[:,1])*0.5*self.height],axis=1)
+        on_screen=in_front&(np.abs(ndc)<=1.0).all(axis=1)
+        return screen,depth,on_screen
+
+    def cull_labels(self, screen, depth, on_screen, widths, priority):
+        #drop labels that are off screen, then place the rest greedily, higher
+        #priority and then nearer first, skipping any whose box overlaps one
+        #already placed. Occupancy is kept on a grid of half-glyph cells.
+        height=self.glyph_atlas.glyph_height
+        boxes_inside=((screen[:,0]+self.LABEL_OFFSET[0]+widths<=self.width)&
+                      (screen[:,1]+self.LABEL_OFFSET[1]>=0))
+        candidates=np.flatnonzero(on_screen&boxes_inside)
+        if len(candidates)==0:
+            return candidates
+        cell=max(height//2,1)
+        occupied=np.zeros((self.height//cell+2,self.width//cell+2),dtype=bool)
+
+        order=candidates[np.lexsort((depth[candidates],-priority[candidates]))]
+        corners=screen[order]+self.LABEL_OFFSET
+        left=np.floor(corners[:,0]/cell).astype(np.int64)
+        top=np.floor(corners[:,1]/cell).astype(np.int64)
+        right=np.ceil((corners[:,0]+widths[order])/cell).astype(np.int64)
+        bottom=np.ceil((corners[:,1]+height)/cell).astype(np.int64)
+        np.clip(top,0,occupied.shape[0],out=top)
+        np.clip(bottom,0,occupied.shape[0],out=bottom)
+
+        kept=[]
+        for index,x0,y0,x1,y1 in zip(order,left,top,right,bottom):
+            box=occupied[y0:y1,x0:x1]
+            if not box.any():
+                box[:]=True
+                kept.append(index)
+        return np.array(kept,dtype=np.int64)
+
+    def draw_labels(self):
+        atlas=self.glyph_atlas
+        if self.lattice_layout is None:
+            texts=[f"({x},{y},{z})" for x,y,z in self.lattice_points]
+            self.lattice_layout=atlas.layout(texts)
+
+        anchors=[self.lattice_points@self.current_matrix.T]
+        colors=[np.tile([0.7,0.85,1.0,0.8],(len(self.lattice_points),1))]
+        priority=[np.zeros(len(self.lattice_points))]
+
+        #basis tips and eigenvectors change every frame, so they are laid out fresh
+        texts=[]
+        axis_colors=[(1.0,0.3,0.3,1.0),(0.3,1.0,0.3,1.0),(0.3,0.5,1.0,1.0)]
+        for axis,tip in enumerate(self.current_basis):
+            texts.append(f"e{axis+1} ({tip[0]:.2f},{tip[1]:.2f},{tip[2]:.2f})")
+            anchors.append(np.array([tip],dtype=float))
+            colors.append(np.array([axis_colors[axis]]))
+        eigenvalues,eigenvectors=np.linalg.eig(self.current_matrix)
+        for value,vector in zip(eigenvalues,eigenvectors.T):
+            if abs(value.imag)<1e-9:
+                texts.append(f"λ={value.real:.2f}")
+                anchors.append(np.array([2.5*vector.real/np.linalg.norm(vector.real)]))
+                colors.append(np.array([(0.3,1.0,0.5,1.0)]))
+        priority.append(np.ones(len(texts)))
+
+        dynamic_layout=atlas.layout(texts)
+        lattice_count=len(self.lattice_points)
+        offsets=np.concatenate([self.lattice_layout[0],dynamic_layout[0]])
+        texcoords=np.concatenate([self.lattice_layout[1],dynamic_layout[1]])
+        quad_labels=np.concatenate([self.lattice_layout[2],dynamic_layout[2]+lattice_count])
+        widths=np.concatenate([self.lattice_layout[3],dynamic_layout[3]])
+        anchors=np.concatenate(anchors)
+        colors=np.concatenate(colors)
+        priority=np.concatenate(priority)
+
+        screen,depth,on_screen=self.project_to_screen(anchors)
+        keep=np.zeros(len(anchors),dtype=bool)
+        keep[self.cull_labels(screen,depth,on_screen,widths,priority)]=True
+
+        quads=np.flatnonzero(keep[quad_labels])
+        origins=screen[quad_labels[quads]]+self.LABEL_OFFSET
+        vertices=(offsets[quads]+origins[:,None,:]).reshape(-1,2)
+        texcoords=texcoords[quads].reshape(-1,2)
+        colors=np.repeat(colors[quad_labels[quads]],4,axis=0)
+
+        self.begin_overlay()
+        atlas.draw(vertices,texcoords,colors)
+        self.end_overlay()
+        self.visible_label_count=int(keep.sum())
 
     def run(self):
         self.init_pygame()
 
-        clock=pygame.time.Clock()
+        pacer=self.frame_pacer
         running=True
 
         print("Linear Transformations Visualizer-First Octant Unit Cube")
         print("="*60)
         print("Controls:")
-        print("G: Open transformation matrix GUI")
+        print("G: Show/hide the matrix editor (drag entries to scrub, click to type)")
         print("R: reset to identity matrix")
+        print("I: repeatedly apply the matrix to a point cloud (A^k trails)")
+        print("F: animate along the flow exp(tL) and advect a particle field")
+        print("T: warp an image on the unit square, TAB: next image")
+        print("L: label lattice points, basis tips and eigenvectors")
+        print("H: hover over the grid to see a point's pre-image and image")
+        print("E: export the current geometry to exports/ (PLY, GLB, NPZ), Shift+E: whole animation")
+        print("N: toggle n-dimensional hypercube mode")
+        print("[ / ]: lower/raise the dimension (2 to 10)")
+        print("M: random n-D transformation   O: toggle n-D point set")
+        print("P: pause projection rotation   Left/Right: rotate projection")
         print("Mouse drag: Rotate Camera")
         print("Mouse wheel: Zoom in/out")
         print("ESC: Exit")
@@ -592,14 +2605,55 @@ class LinearTransformationVisualizer:
         print("Watch how the entire coordinate space transforms!")
 
         while running:
+            #wait first, then read input, so what is drawn reflects the newest events
+            steps,fraction=pacer.wait_for_frame()
+
             for event in pygame.event.get():
+                #the editor sees input first so drags on it don't turn the camera
+                if self.matrix_editor.handle_event(event):
+                    continue
                 if event.type==pygame.QUIT:
                     running=False
                 elif event.type==pygame.KEYDOWN:
                     if event.key==pygame.K_g: #g is pressed
-                        self.show_matrix_gui()
+                        self.matrix_editor.visible=not self.matrix_editor.visible
                     elif event.key==pygame.K_r:
-                        self.apply_transformation(np.eye(3))
+                        if self.show_nd:
+                            self.nd_mode.apply_transformation(np.eye(self.nd_mode.dimension))
+                        else:
+                            self.matrix_editor.set_matrix(np.eye(3))
+                    elif event.key==pygame.K_i:
+                        self.show_iterated_map=not self.show_iterated_map
+                        self.iterated_map.reset()
+                    elif event.key==pygame.K_f:
+                        self.flow_mode=not self.flow_mode
+                    elif event.key==pygame.K_t:
+                        self.show_image=not self.show_image
+                    elif event.key==pygame.K_TAB and self.show_image and self.image_paths:
+                        self.image_index=(self.image_index+1)%len(self.image_paths)
+                    elif event.key==pygame.K_l:
+                        self.show_labels=not self.show_labels
+                    elif event.key==pygame.K_h:
+                        self.show_hover=not self.show_hover
+                        self.hover_pos=pygame.mouse.get_pos() if self.show_hover else None
+                    elif event.key==pygame.K_e:
+                        self.export_from_keyboard(animation=bool(event.mod&KMOD_SHIFT))
+                    elif event.key==pygame.K_n:
+                        self.show_nd=not self.show_nd
+                    elif event.key==pygame.K_LEFTBRACKET and self.show_nd:
+                        self.nd_mode.set_dimension(self.nd_mode.dimension-1)
+                    elif event.key==pygame.K_RIGHTBRACKET and self.show_nd:
+                        self.nd_mode.set_dimension(self.nd_mode.dimension+1)
+                    elif event.key==pygame.K_m and self.show_nd:
+                        self.nd_mode.apply_transformation(self.nd_mode.random_matrix())
+                    elif event.key==pygame.K_p and self.show_nd:
+                        self.nd_mode.auto_rotate=not self.nd_mode.auto_rotate
+                    elif event.key==pygame.K_o and self.show_nd:
+                        self.nd_mode.show_points=not self.nd_mode.show_points
+                    elif event.key==pygame.K_LEFT and self.show_nd:
+                        self.nd_mode.projection_angle-=0.1
+                    elif event.key==pygame.K_RIGHT and self.show_nd:
+                        self.nd_mode.projection_angle+=0.1
                     elif event.key==pygame.K_ESCAPE:
                         running=False
                 elif event.type==pygame.MOUSEMOTION:
@@ -607,40 +2661,124 @@ class LinearTransformationVisualizer:
                 elif event.type in [pygame.MOUSEBUTTONDOWN,pygame.MOUSEBUTTONUP]:
                     self.handle_mouse_button(event)
 
-            self.update_animation()
+            self.apply_pending_edit()
+            for _ in range(steps):
+                self.update_animation(pacer.update_step)
+            self.update_geometry(fraction*pacer.update_step)
 
             #clear screen
             glClear(GL_COLOR_BUFFER_BIT|GL_DEPTH_BUFFER_BIT)
 
             #set up camera
             self.set_camera()
+            self.capture_scene_matrices()
 
             #draw scene
-            self.draw_transformed_grid()
+            if self.show_nd:
+                self.draw_nd_scene()
+            else:
+                self.draw_transformed_grid()
 
-            #if the final cube is different from the original
-            # draw original cube (semi-transparent wireframe)
-            if self.is_animating or not np.allclose(self.transform_matrix, np.eye(3)):
-                self.draw_cube(self.original_cube, color=(0.8,0.8,0.8),alpha=0.3, wireframe=True)
+                #if the final cube is different from the original
+                # draw original cube (semi-transparent wireframe)
+                if self.is_animating or not np.allclose(self.transform_matrix, np.eye(3)):
+                    self.draw_cube(self.original_cube, color=(0.8,0.8,0.8),alpha=0.3, wireframe=True)
 
-            #draw current cube
-            self.draw_cube(self.current_cube,color=(1.0,0.6,0.2),alpha=0.8)
+                if self.show_image:
+                    self.draw_image_plane()
+
+                #draw current cube
+                self.draw_cube(self.current_cube,color=(1.0,0.6,0.2),alpha=0.8)
+
+                if self.show_iterated_map:
+                    self.draw_iterated_map()
+
+                if self.flow_mode:
+                    self.draw_particles()
+
+                if self.show_hover:
+                    self.draw_hover()
+
+                self.draw_translucent_pass()
+
+                if self.show_labels:
+                    self.draw_labels()
+
+                if self.show_hover:
+                    self.draw_hover_readout()
 
             # #draw info panel
             self.draw_info_panel()
+            self.draw_matrix_editor()
 
             pygame.display.flip()
-            clock.tick(60)
         
-        #clean up GIU
-        if self.gui and self.gui.root:
-            self.gui.close_gui()
+        if self.text_cache:
+            self.text_cache.release()
+        if self.glyph_atlas:
+            self.glyph_atlas.release()
+        if self.batch_renderer:
+            self.batch_renderer.release()
+        self.iterated_map.trails.release()
+        if self.texture_cache:
+            self.texture_cache.release()
 
         pygame.quit()
 
+def parse_args():
+    parser=argparse.ArgumentParser(description="Linear Transformations Visualizer")
+    parser.add_argument("--renderer",choices=BatchRenderer.BACKENDS,
+                        help="force a drawing backend instead of the probed one")
+    parser.add_argument("--reprobe",action="store_true",
+                        help="ignore the cached renderer choice and benchmark again")
+    parser.add_argument("--particles",type=int,default=200000,
+                        help="number of particles advected in flow mode")
+    parser.add_argument("--image",action="append",default=[],
+                        help="picture to warp in image mode (can be given more than once)")
+    parser.add_argument("--fps",type=int,default=60,
+                        help="cap on frames drawn per second, 0 for uncapped")
+    parser.add_argument("--update-rate",type=int,default=120,
+                        help="fixed animation steps per second, independent of --fps")
+    parser.add_argument("--export",metavar="PATH",
+                        help="write the transformed geometry to PATH (.ply, .glb, .gltf, .npz) and exit")
+    parser.add_argument("--export-frames",type=int,default=1,
+                        help="with --export, sample this many frames of the animation")
+    parser.add_argument("--matrix",metavar="A11,A12,...,A33",
+                        help="with --export, the 3x3 matrix to apply, row by row")
+    parser.add_argument("--flow",action="store_true",
+                        help="with --export, animate along exp(tL) instead of the straight blend")
+    args=parser.parse_args()
+
+    if args.fps<0:
+        parser.error("--fps must be 0 (uncapped) or more")
+    if args.update_rate<=0:
+        parser.error("--update-rate must be a positive number of steps per second")
+    if args.export_frames<1:
+        parser.error("--export-frames must be at least 1")
+    if args.matrix is not None:
+        try:
+            values=[float(value) for value in args.matrix.split(",")]
+        except ValueError:
+            parser.error(f"--matrix must be 9 comma-separated numbers, got {args.matrix!r}")
+        if len(values)!=9 or not np.all(np.isfinite(values)):
+            parser.error(f"--matrix must be 9 comma-separated finite numbers, got {args.matrix!r}")
+        args.matrix=np.array(values).reshape(3,3)
+    return args
+
 def main():
+    args=parse_args()
     try:
-        visualizer=LinearTransformationVisualizer()
+        visualizer=LinearTransformationVisualizer(renderer=args.renderer,reprobe=args.reprobe,
+                                                  particle_count=args.particles,image_paths=args.image,
+                                                  max_fps=args.fps,update_rate=args.update_rate)
+        if args.export:
+            #no window needed, just write the files
+            if args.matrix is not None:
+                visualizer.flow_mode=args.flow
+                visualizer.apply_transformation(args.matrix,animate=False)
+            for path in visualizer.export_geometry(args.export,frames=args.export_frames):
+                print(f"Exported {path}")
+            return
         visualizer.run()
 
     except Exception as e: